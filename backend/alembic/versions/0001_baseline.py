@@ -0,0 +1,20 @@
+"""Baseline: the schema create_all built before migrations were tracked
+
+Databases created before Alembic was introduced already match this revision;
+mark them with ``alembic stamp 0001_baseline`` and then ``alembic upgrade head``.
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-16
+"""
+
+revision = "0001_baseline"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    pass
+
+def downgrade() -> None:
+    pass
@@ -0,0 +1,126 @@
+"""Alert dedup columns, PostGIS geography columns, UUID keys and notification columns
+
+- alerts: source_id, dedup_bucket and their indexes, the generated geom column
+  and its GiST index
+- alert_notifications and user_preferences: primary keys become native UUIDs
+- alert_notifications: per-user history and stats indexes
+- users: device_token
+- user_preferences: notification channel columns
+- user_locations: the generated geom column and its GiST index
+- tide_data, wave_data, weather_data: station/time indexes sorted newest first
+
+The PostGIS extension, geography columns, GiST indexes and UUID column types
+are PostgreSQL-only. Other databases get an empty geom column, like create_all
+gives them, and keep their text keys.
+
+Revision ID: 0002_alert_dedup_geography_uuid_keys
+Revises: 0001_baseline
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002_alert_dedup_geography_uuid_keys"
+down_revision = "0001_baseline"
+branch_labels = None
+depends_on = None
+
+POINT_FROM_LAT_LON = "ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)::geography"
+GEOGRAPHY_TABLES = (("alerts", "idx_alert_geom"), ("user_locations", "idx_user_location_geom"))
+UUID_KEY_TABLES = ("alert_notifications", "user_preferences")
+STATION_TIME_INDEXES = (
+    ("tide_data", "idx_tide_station_time"),
+    ("wave_data", "idx_wave_station_time"),
+    ("weather_data", "idx_weather_station_time"),
+)
+
+def _is_postgresql() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+def upgrade() -> None:
+    postgresql = _is_postgresql()
+
+    op.add_column("alerts", sa.Column("source_id", sa.String(), nullable=True))
+    op.add_column("alerts", sa.Column("dedup_bucket", sa.Integer(), nullable=True))
+    op.create_index(
+        "idx_alert_active_by_source", "alerts",
+        ["source_id", "alert_type", sa.text("created_at DESC")],
+        postgresql_where=sa.text("is_active = true")
+    )
+    op.create_index("idx_alert_listing", "alerts", [sa.text("created_at DESC"), "alert_type", "severity"])
+    op.create_index(
+        "uq_alert_station_type_bucket", "alerts", ["source_id", "alert_type", "dedup_bucket"],
+        unique=True, postgresql_where=sa.text("dedup_bucket IS NOT NULL")
+    )
+
+    if postgresql:
+        op.execute("CREATE EXTENSION IF NOT EXISTS postgis")
+    for table, index in GEOGRAPHY_TABLES:
+        if postgresql:
+            op.execute(
+                f"ALTER TABLE {table} ADD COLUMN geom geography(Point,4326) "
+                f"GENERATED ALWAYS AS ({POINT_FROM_LAT_LON}) STORED"
+            )
+            op.create_index(index, table, ["geom"], postgresql_using="gist")
+        else:
+            op.add_column(table, sa.Column("geom", sa.LargeBinary(), nullable=True))
+
+    if postgresql:
+        # Existing keys are uuid4 strings, so they cast directly
+        for table in UUID_KEY_TABLES:
+            op.alter_column(
+                table, "id", type_=sa.Uuid(), existing_type=sa.String(),
+                postgresql_using="id::uuid"
+            )
+
+    op.create_index(
+        "idx_notification_user_status_method", "alert_notifications",
+        ["user_id", "status", "notification_method"]
+    )
+    op.create_index("idx_notification_user_sent", "alert_notifications", ["user_id", sa.text("sent_at DESC")])
+
+    op.add_column("users", sa.Column("device_token", sa.String(), nullable=True))
+
+    op.add_column("user_preferences", sa.Column("notification_methods", sa.JSON(), nullable=True))
+    op.add_column("user_preferences", sa.Column("phone_number", sa.String(), nullable=True))
+    op.add_column("user_preferences", sa.Column("alert_types", sa.JSON(), nullable=True))
+    op.add_column("user_preferences", sa.Column("severity_threshold", sa.String(), nullable=True))
+
+    for table, index in STATION_TIME_INDEXES:
+        op.drop_index(index, table_name=table)
+        op.create_index(index, table, ["station_id", sa.text("timestamp DESC")])
+
+def downgrade() -> None:
+    postgresql = _is_postgresql()
+
+    for table, index in STATION_TIME_INDEXES:
+        op.drop_index(index, table_name=table)
+        op.create_index(index, table, ["station_id", "timestamp"])
+
+    op.drop_column("user_preferences", "severity_threshold")
+    op.drop_column("user_preferences", "alert_types")
+    op.drop_column("user_preferences", "phone_number")
+    op.drop_column("user_preferences", "notification_methods")
+
+    op.drop_column("users", "device_token")
+
+    op.drop_index("idx_notification_user_sent", table_name="alert_notifications")
+    op.drop_index("idx_notification_user_status_method", table_name="alert_notifications")
+
+    if postgresql:
+        for table in UUID_KEY_TABLES:
+            op.alter_column(
+                table, "id", type_=sa.String(), existing_type=sa.Uuid(),
+                postgresql_using="id::text"
+            )
+
+    for table, index in GEOGRAPHY_TABLES:
+        if postgresql:
+            op.drop_index(index, table_name=table)
+        op.drop_column(table, "geom")
+
+    op.drop_index("uq_alert_station_type_bucket", table_name="alerts")
+    op.drop_index("idx_alert_listing", table_name="alerts")
+    op.drop_index("idx_alert_active_by_source", table_name="alerts")
+    op.drop_column("alerts", "dedup_bucket")
+    op.drop_column("alerts", "source_id")
@@ -0,0 +1,29 @@
+"""Alert metadata and resolution columns
+
+- alerts.alert_metadata: JSONB on PostgreSQL, JSON elsewhere
+- alerts.resolved_by, resolved_at, resolution_notes: recorded by resolve_alert
+
+Revision ID: 0003_alert_metadata_and_resolution
+Revises: 0002_alert_dedup_geography_uuid_keys
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+revision = "0003_alert_metadata_and_resolution"
+down_revision = "0002_alert_dedup_geography_uuid_keys"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.add_column("alerts", sa.Column("alert_metadata", sa.JSON().with_variant(JSONB(), "postgresql"), nullable=True))
+    op.add_column("alerts", sa.Column("resolved_by", sa.String(), nullable=True))
+    op.add_column("alerts", sa.Column("resolved_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("alerts", sa.Column("resolution_notes", sa.Text(), nullable=True))
+
+def downgrade() -> None:
+    op.drop_column("alerts", "resolution_notes")
+    op.drop_column("alerts", "resolved_at")
+    op.drop_column("alerts", "resolved_by")
+    op.drop_column("alerts", "alert_metadata")
@@ -47,6 +47,10 @@ class Settings(BaseSettings):
     firebase_credentials_path: Optional[str] = None
     firebase_project_id: Optional[str] = None
     
+    # Alert notifications coalesced per dispatch, and how long to wait filling a batch
+    notification_batch_size: int = 500
+    notification_batch_delay_ms: int = 100
+    
     # ML/AI settings
     model_storage_path: str = "./models"
     enable_model_training: bool = True
@@ -61,6 +65,9 @@ class Settings(BaseSettings):
     allowed_hosts: List[str] = ["localhost", "127.0.0.1"]
     cors_origins: List[str] = ["http://localhost:3000", "http://127.0.0.1:3000"]
     
+    # Caching
+    redis_url: str = "redis://localhost:6379/0"
+    
     # Rate limiting
     rate_limit_requests: int = 100
     rate_limit_window_minutes: int = 15
@@ -117,6 +124,7 @@ class Settings(BaseSettings):
             'debug': {'env': 'DEBUG'},
             'log_level': {'env': 'LOG_LEVEL'},
             'log_file': {'env': 'LOG_FILE'},
+            'redis_url': {'env': 'REDIS_URL'},
             'cors_origins': {'env': 'CORS_ORIGINS'},
             'allowed_hosts': {'env': 'ALLOWED_HOSTS'}
         }
@@ -1,8 +1,12 @@
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.redis import RedisBackend
+from redis import asyncio as aioredis
+import asyncio
 import logging
 import os
 from dotenv import load_dotenv
@@ -13,6 +17,10 @@ from app.routers import monitoring as monitoring_router
 
 # Import models to ensure they are registered with SQLAlchemy
 from app.models import monitoring, environmental_data, alert
+from app.config import settings
+from app import schemas
+from app.utils.response_cache import ResponseCacheMiddleware
+from app.services.alert_service import alert_service
 
 # Load environment variables
 load_dotenv()
@@ -30,6 +38,19 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting up Coastal Guard API...")
     
+    # Initialize response cache
+    redis = aioredis.from_url(settings.redis_url)
+    app.state.redis = redis
+    FastAPICache.init(RedisBackend(redis), prefix="ctas-monitor")
+    
+    # Import all schema modules and build their validators before the first request
+    schemas.warmup()
+    # FastAPI caches the generated document, so build it once here instead of on the first /docs hit
+    app.openapi()
+    
+    # Keep this worker's preferences cache in sync with the others
+    prefs_listener = asyncio.create_task(notifications.listen_for_preference_invalidations(redis))
+    
     # Initialize services here if needed
     # await initialize_ml_models()
     # await setup_database_connections()
@@ -38,6 +59,16 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down Coastal Guard API...")
+    prefs_listener.cancel()
+    try:
+        await prefs_listener
+    except asyncio.CancelledError:
+        pass
+    except Exception as e:
+        logger.error(f"Preferences invalidation listener stopped with an error: {e}")
+    # Write alert metrics still buffered in this worker
+    await alert_service.close()
+    await redis.close()
     # Cleanup resources here if needed
 
 # Create FastAPI application
@@ -47,9 +78,25 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
+# Serve serialized monitoring responses straight from Redis; added first so it
+# runs inside CORS and trusted-host checks
+app.add_middleware(
+    ResponseCacheMiddleware,
+    cached_endpoints={
+        "/api/v1/monitoring/coastal-erosion/": monitoring_router.EROSION_CACHE_TTL,
+        "/api/v1/monitoring/algal-blooms/": monitoring_router.ALGAL_BLOOM_CACHE_TTL,
+        "/api/v1/monitoring/water-quality/": monitoring_router.WATER_QUALITY_CACHE_TTL,
+        "/api/v1/monitoring/satellite-imagery/": monitoring_router.SATELLITE_IMAGERY_CACHE_TTL,
+        "/api/v1/monitoring/environmental-summary/": monitoring_router.SUMMARY_CACHE_TTL,
+    },
+    alternate_media_types=("application/msgpack",),
+    authenticate=auth.is_valid_token
+)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -75,7 +122,7 @@ app.add_middleware(
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     logger.error(f"Global exception: {str(exc)}", exc_info=True)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "Internal server error"}
     )
@@ -1,7 +1,10 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text, JSON, Index
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text, JSON, Index, Uuid, Computed, event
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
+from uuid_extensions import uuid7str
 from datetime import datetime
 from .monitoring import Base
+from .types import CREATE_POSTGIS, POINT_FROM_LAT_LON, Geography
 
 class Alert(Base):
     __tablename__ = "alerts"
@@ -24,6 +27,11 @@ class Alert(Base):
     location_name = Column(String, nullable=False)
     affected_radius_km = Column(Float, default=10.0)
     region = Column(String, nullable=True)
+    # Kept in sync with latitude/longitude by the database for indexed radius queries
+    geom = Column(
+        Geography(),
+        Computed(POINT_FROM_LAT_LON, persisted=True)
+    )
     
     # Timing
     issued_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
@@ -46,6 +54,8 @@ class Alert(Base):
     
     # Source and confidence
     source_system = Column(String, nullable=False)  # ML_model, manual, external_api
+    source_id = Column(String, nullable=True)  # Monitoring station that raised the alert
+    dedup_bucket = Column(Integer, nullable=True)  # Time window index for station alerts, see AlertService
     data_sources = Column(JSON, default=list)  # List of data sources used
     confidence_score = Column(Float, nullable=True)  # 0-1 confidence level
     model_version = Column(String, nullable=True)
@@ -59,6 +69,9 @@ class Alert(Base):
     acknowledged_by = Column(String, nullable=True)  # User ID who acknowledged
     acknowledged_at = Column(DateTime(timezone=True), nullable=True)
     acknowledgment_notes = Column(Text, nullable=True)
+    resolved_by = Column(String, nullable=True)  # User ID who resolved
+    resolved_at = Column(DateTime(timezone=True), nullable=True)
+    resolution_notes = Column(Text, nullable=True)
     
     # Recommendations and actions
     recommendations = Column(JSON, default=list)  # List of recommended actions
@@ -68,23 +81,34 @@ class Alert(Base):
     # Metadata
     tags = Column(JSON, default=list)  # Searchable tags
     external_alert_ids = Column(JSON, default=dict)  # IDs from external systems
+    alert_metadata = Column(JSON().with_variant(JSONB(), "postgresql"), default=dict)  # Readings and trigger details from the raising system
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     __table_args__ = (
         Index('idx_alert_location_time', 'latitude', 'longitude', 'issued_at'),
+        Index('idx_alert_geom', 'geom', postgresql_using='gist').ddl_if(dialect='postgresql'),
         Index('idx_alert_type_severity', 'alert_type', 'severity'),
         Index('idx_alert_status_active', 'status', 'is_active'),
+        # Monitoring loop's recent-alert lookup; only active alerts are indexed
+        Index('idx_alert_active_by_source', 'source_id', 'alert_type', created_at.desc(),
+              postgresql_where=(is_active == True)),
+        Index('idx_alert_listing', created_at.desc(), 'alert_type', 'severity'),
+        # One alert per station, type and window; inserts rely on ON CONFLICT DO NOTHING
+        Index('uq_alert_station_type_bucket', 'source_id', 'alert_type', 'dedup_bucket',
+              unique=True, postgresql_where=(dedup_bucket.isnot(None))),
     )
     
     def __repr__(self):
         return f"<Alert(id={self.id}, type={self.alert_type}, severity={self.severity}, status={self.status})>"
 
+event.listen(Alert.__table__, "before_create", CREATE_POSTGIS)
+
 class AlertNotification(Base):
     __tablename__ = "alert_notifications"
     
-    id = Column(String, primary_key=True, index=True)
+    id = Column(Uuid(as_uuid=False), primary_key=True, index=True, default=uuid7str)  # time-ordered UUIDv7
     alert_id = Column(String, nullable=False, index=True)
     user_id = Column(String, nullable=False, index=True)
     
@@ -126,6 +150,8 @@ class AlertNotification(Base):
     __table_args__ = (
         Index('idx_notification_alert_user', 'alert_id', 'user_id'),
         Index('idx_notification_status_retry', 'status', 'next_retry_at'),
+        Index('idx_notification_user_status_method', 'user_id', 'status', 'notification_method'),
+        Index('idx_notification_user_sent', 'user_id', sent_at.desc()),
     )
     
     def __repr__(self):
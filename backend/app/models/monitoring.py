@@ -76,7 +76,7 @@ class TideData(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     __table_args__ = (
-        Index('idx_tide_station_time', 'station_id', 'timestamp'),
+        Index('idx_tide_station_time', 'station_id', timestamp.desc()),
     )
     
     def __repr__(self):
@@ -114,7 +114,7 @@ class WaveData(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     __table_args__ = (
-        Index('idx_wave_station_time', 'station_id', 'timestamp'),
+        Index('idx_wave_station_time', 'station_id', timestamp.desc()),
     )
     
     def __repr__(self):
@@ -161,7 +161,7 @@ class WeatherData(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     __table_args__ = (
-        Index('idx_weather_station_time', 'station_id', 'timestamp'),
+        Index('idx_weather_station_time', 'station_id', timestamp.desc()),
         Index('idx_weather_location_time', 'latitude', 'longitude', 'timestamp'),
     )
     
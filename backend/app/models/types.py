@@ -0,0 +1,33 @@
+from sqlalchemy import DDL, LargeBinary
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.schema import CreateColumn
+from sqlalchemy.types import UserDefinedType
+
+# Run before creating any table with a Geography column; other dialects have no PostGIS
+CREATE_POSTGIS = DDL("CREATE EXTENSION IF NOT EXISTS postgis").execute_if(dialect="postgresql")
+
+class Geography(UserDefinedType):
+    """PostGIS ``geography(Point,4326)`` column type"""
+    cache_ok = True
+
+    def get_col_spec(self, **kw):
+        return "geography(Point,4326)"
+
+# Expression for a Geography column generated from latitude/longitude columns
+POINT_FROM_LAT_LON = "ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)::geography"
+
+@compiles(CreateColumn)
+def _create_geography_column(element, compiler, **kw):
+    """Emit Geography columns as plain nullable binary columns outside PostgreSQL.
+
+    The PostGIS type and generating expression only exist there, so on SQLite
+    (local and test databases) the column is created empty rather than failing
+    ``create_all``; the ORM never writes it because it is ``Computed``.
+    """
+    column = element.element
+    if compiler.dialect.name == "postgresql" or not isinstance(column.type, Geography):
+        return compiler.visit_create_column(element, **kw)
+    return "%s %s" % (
+        compiler.preparer.format_column(column),
+        compiler.dialect.type_compiler_instance.process(LargeBinary())
+    )
@@ -1,7 +1,9 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text, JSON
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text, JSON, Uuid, Computed, Index, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
+from uuid_extensions import uuid7str
 from datetime import datetime
+from .types import CREATE_POSTGIS, POINT_FROM_LAT_LON, Geography
 
 Base = declarative_base()
 
@@ -33,6 +35,7 @@ class User(Base):
     email_notifications = Column(Boolean, default=True)
     sms_notifications = Column(Boolean, default=False)
     push_notifications = Column(Boolean, default=True)
+    device_token = Column(String, nullable=True)  # push notification token
     
     # Alert preferences
     alert_types = Column(JSON, default=list)  # List of alert types user wants to receive
@@ -83,7 +86,7 @@ class UserSession(Base):
 class UserPreferences(Base):
     __tablename__ = "user_preferences"
     
-    id = Column(String, primary_key=True, index=True)
+    id = Column(Uuid(as_uuid=False), primary_key=True, index=True, default=uuid7str)  # time-ordered UUIDv7
     user_id = Column(String, nullable=False, index=True, unique=True)
     
     # Dashboard preferences
@@ -107,6 +110,12 @@ class UserPreferences(Base):
     erosion_alerts = Column(Boolean, default=False)
     water_quality_alerts = Column(Boolean, default=False)
     
+    # Notification channels
+    notification_methods = Column(JSON, default=list)  # email, sms, push
+    phone_number = Column(String, nullable=True)
+    alert_types = Column(JSON, default=list)
+    severity_threshold = Column(String, default="medium")  # low, medium, high, critical
+    
     # Notification timing
     quiet_hours_start = Column(String, default="22:00")  # HH:MM format
     quiet_hours_end = Column(String, default="07:00")
@@ -133,6 +142,8 @@ class UserLocation(Base):
     name = Column(String, nullable=False)  # User-defined name
     latitude = Column(Float, nullable=False)
     longitude = Column(Float, nullable=False)
+    # Kept in sync with latitude/longitude by the database for indexed radius queries
+    geom = Column(Geography(), Computed(POINT_FROM_LAT_LON, persisted=True))
     address = Column(String, nullable=True)
     
     # Location metadata
@@ -148,9 +159,15 @@ class UserLocation(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    __table_args__ = (
+        Index('idx_user_location_geom', 'geom', postgresql_using='gist').ddl_if(dialect='postgresql'),
+    )
+    
     def __repr__(self):
         return f"<UserLocation(id={self.id}, name={self.name}, user_id={self.user_id})>"
 
+event.listen(UserLocation.__table__, "before_create", CREATE_POSTGIS)
+
 class UserActivity(Base):
     __tablename__ = "user_activities"
     
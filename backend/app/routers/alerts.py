@@ -1,14 +1,48 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from app.routers.auth import get_current_user_dependency
-from app.schemas.dashboard import AlertResponse
+from app.schemas.alerts import AlertDetails, AlertLocation, AlertMetadata, AlertResponse, AlertResponseList
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+def _sample_alert() -> AlertResponse:
+    """Placeholder alert served until these endpoints query the database"""
+    now = datetime.utcnow()
+    return AlertResponse(
+        id="alert_001",
+        alert_type="flood",
+        severity="high",
+        title="High Tide Warning",
+        description="Unusually high tide levels expected in Chennai Marina Beach area",
+        location=AlertLocation(
+            latitude=13.0475,
+            longitude=80.2824,
+            location_name="Chennai Marina Beach",
+            region="Tamil Nadu"
+        ),
+        issued_at=now - timedelta(hours=2),
+        expires_at=now + timedelta(hours=6),
+        status="active",
+        priority="high",
+        alert_metadata=AlertMetadata(
+            source="tide_gauge",
+            confidence=0.9,
+            data_quality="good",
+            verification_status="verified"
+        ),
+        details=AlertDetails(
+            predicted_peak_time=now + timedelta(hours=3),
+            expected_duration_hours=6,
+            infrastructure_impact="Marina Beach, Besant Nagar, Thiruvanmiyur"
+        ),
+        recommendations=["Avoid beach areas during high tide"],
+        emergency_contacts=["Coast Guard: 1554"]
+    )
+
 @router.get("/", response_model=List[AlertResponse])
 async def get_alerts(
     active_only: bool = Query(True, description="Return only active alerts"),
@@ -21,32 +55,19 @@ async def get_alerts(
         # Placeholder implementation
         # In production, this would query the database
         sample_alerts = [
-            AlertResponse(
-                id="alert_001",
-                alert_type="flood",
-                severity="high",
-                title="High Tide Warning",
-                message="Unusually high tide levels expected in Chennai Marina Beach area",
-                location="Chennai Marina Beach",
-                latitude=13.0475,
-                longitude=80.2824,
-                issued_at=datetime.utcnow() - timedelta(hours=2),
-                expires_at=datetime.utcnow() + timedelta(hours=6),
-                is_active=True,
-                affected_areas=["Marina Beach", "Besant Nagar", "Thiruvanmiyur"]
-            )
+            _sample_alert()
         ]
         
         # Apply filters
         filtered_alerts = sample_alerts
         if active_only:
-            filtered_alerts = [alert for alert in filtered_alerts if alert.is_active]
+            filtered_alerts = [alert for alert in filtered_alerts if alert.status == "active"]
         if severity:
             filtered_alerts = [alert for alert in filtered_alerts if alert.severity == severity]
         if alert_type:
             filtered_alerts = [alert for alert in filtered_alerts if alert.alert_type == alert_type]
             
-        return filtered_alerts
+        return Response(AlertResponseList.serializer.to_json(filtered_alerts), media_type="application/json")
         
     except Exception as e:
         logger.error(f"Error fetching alerts: {e}")
@@ -61,20 +82,7 @@ async def get_alert(
     try:
         # Placeholder implementation
         if alert_id == "alert_001":
-            return AlertResponse(
-                id="alert_001",
-                alert_type="flood",
-                severity="high",
-                title="High Tide Warning",
-                message="Unusually high tide levels expected in Chennai Marina Beach area",
-                location="Chennai Marina Beach",
-                latitude=13.0475,
-                longitude=80.2824,
-                issued_at=datetime.utcnow() - timedelta(hours=2),
-                expires_at=datetime.utcnow() + timedelta(hours=6),
-                is_active=True,
-                affected_areas=["Marina Beach", "Besant Nagar", "Thiruvanmiyur"]
-            )
+            return _sample_alert()
         else:
             raise HTTPException(status_code=404, detail="Alert not found")
             
@@ -237,43 +245,30 @@ async def get_alert_statistics(
         logger.error(f"Error getting alert statistics: {e}")
         raise HTTPException(status_code=500, detail="Failed to get alert statistics")
 
-@router.get("/active")
+@router.get("/active", response_model=List[AlertResponse])
 async def get_active_alerts(
     location: Optional[str] = Query(None, description="Filter by location"),
     alert_type: Optional[str] = Query(None, description="Filter by alert type"),
     severity: Optional[str] = Query(None, description="Filter by severity"),
     current_user: dict = Depends(get_current_user_dependency)
-) -> List[AlertResponse]:
+):
     """Get all currently active alerts with optional filters"""
     try:
         # Placeholder implementation - reuse the sample alert from the main get_alerts endpoint
         sample_alerts = [
-            AlertResponse(
-                id="alert_001",
-                alert_type="flood",
-                severity="high",
-                title="High Tide Warning",
-                message="Unusually high tide levels expected in Chennai Marina Beach area",
-                location="Chennai Marina Beach",
-                latitude=13.0475,
-                longitude=80.2824,
-                issued_at=datetime.utcnow() - timedelta(hours=2),
-                expires_at=datetime.utcnow() + timedelta(hours=6),
-                is_active=True,
-                affected_areas=["Marina Beach", "Besant Nagar", "Thiruvanmiyur"]
-            )
+            _sample_alert()
         ]
         
         # Apply filters
-        filtered_alerts = [alert for alert in sample_alerts if alert.is_active]
+        filtered_alerts = [alert for alert in sample_alerts if alert.status == "active"]
         if location:
-            filtered_alerts = [alert for alert in filtered_alerts if location.lower() in alert.location.lower()]
+            filtered_alerts = [alert for alert in filtered_alerts if location.lower() in alert.location.location_name.lower()]
         if alert_type:
             filtered_alerts = [alert for alert in filtered_alerts if alert.alert_type == alert_type]
         if severity:
             filtered_alerts = [alert for alert in filtered_alerts if alert.severity == severity]
         
-        return filtered_alerts
+        return Response(AlertResponseList.serializer.to_json(filtered_alerts), media_type="application/json")
         
     except Exception as e:
         logger.error(f"Error getting active alerts: {e}")
@@ -254,4 +254,15 @@ async def get_current_user_dependency(
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token"
-        )
\ No newline at end of file
+        )
+
+async def is_valid_token(token: str) -> bool:
+    """Check a bearer token the same way get_current_user_dependency does"""
+    try:
+        await get_current_user_dependency(
+            HTTPAuthorizationCredentials(scheme="Bearer", credentials=token),
+            get_supabase()
+        )
+        return True
+    except HTTPException:
+        return False
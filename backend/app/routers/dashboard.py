@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional
 from datetime import datetime, timedelta
 from app.routers.auth import get_current_user_dependency
@@ -26,7 +27,7 @@ async def get_monitoring_stations(
         data_service = DataCollectionService()
         stations = await data_service.get_monitoring_stations(active_only=active_only)
         
-        return [
+        return ORJSONResponse([
             MonitoringStationResponse(
                 id=station["id"],
                 name=station["name"],
@@ -38,7 +39,7 @@ async def get_monitoring_stations(
                 last_updated=station.get("last_updated", datetime.utcnow())
             )
             for station in stations
-        ]
+        ])
         
     except Exception as e:
         logger.error(f"Error fetching monitoring stations: {e}")
@@ -62,7 +63,7 @@ async def get_station_tide_data(
             end_time=end_time
         )
         
-        return [
+        return ORJSONResponse([
             TideDataResponse(
                 timestamp=data["timestamp"],
                 tide_level=data["tide_level"],
@@ -71,7 +72,7 @@ async def get_station_tide_data(
                 station_id=station_id
             )
             for data in tide_data
-        ]
+        ])
         
     except Exception as e:
         logger.error(f"Error fetching tide data for station {station_id}: {e}")
@@ -88,7 +89,7 @@ async def get_weather_data(
         # weather_data = await weather_service.get_current_weather(location)
         weather_data = {"message": "Weather service not implemented yet"}
         
-        return WeatherDataResponse(
+        return ORJSONResponse(WeatherDataResponse(
             location=location,
             temperature=weather_data["temperature"],
             humidity=weather_data["humidity"],
@@ -98,7 +99,7 @@ async def get_weather_data(
             wave_height=weather_data.get("wave_height"),
             wave_period=weather_data.get("wave_period"),
             timestamp=weather_data["timestamp"]
-        )
+        ))
         
     except Exception as e:
         logger.error(f"Error fetching weather data for {location}: {e}")
@@ -126,13 +127,13 @@ async def get_dashboard_summary(
         # Get current risk level (simplified)
         risk_level = await data_service.calculate_current_risk_level()
         
-        return DashboardSummary(
+        return ORJSONResponse(DashboardSummary(
             total_stations=total_stations,
             active_alerts=active_alerts,
             risk_level=risk_level,
             last_updated=latest_update or datetime.utcnow(),
             system_status="operational"
-        )
+        ))
         
     except Exception as e:
         logger.error(f"Error generating dashboard summary: {e}")
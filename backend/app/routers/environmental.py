@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 
-from app.database import get_db
+from app.database import get_async_db
 from app.services.environmental_service import environmental_service
 from app.routers.auth import get_current_user_dependency
+from app.utils.concurrency import single_flight
 from loguru import logger
 
 router = APIRouter(tags=["environmental"])
@@ -14,7 +15,7 @@ router = APIRouter(tags=["environmental"])
 async def get_current_environmental_data(
     station_id: Optional[str] = Query(None, description="Specific station ID"),
     current_user: dict = Depends(get_current_user_dependency),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Dict[str, Any]:
     """Get current environmental data from all or specific monitoring stations"""
     try:
@@ -48,7 +49,7 @@ async def get_historical_environmental_data(
     station_id: str = Query(..., description="Station ID"),
     days: int = Query(7, description="Number of days to look back", ge=1, le=90),
     current_user: dict = Depends(get_current_user_dependency),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> List[Dict[str, Any]]:
     """Get historical environmental data for a specific station"""
     try:
@@ -78,7 +79,7 @@ async def get_environmental_trends(
     station_id: str = Query(..., description="Station ID"),
     days: int = Query(30, description="Number of days to analyze", ge=7, le=365),
     current_user: dict = Depends(get_current_user_dependency),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Dict[str, Any]:
     """Get environmental trend analysis for a specific station"""
     try:
@@ -105,7 +106,7 @@ async def get_current_satellite_data(
 ) -> Dict[str, Any]:
     """Get current satellite data and imagery information"""
     try:
-        satellite_data = await environmental_service._collect_satellite_data()
+        satellite_data = await single_flight("satellite/current", environmental_service._collect_satellite_data)
         
         if not satellite_data:
             raise HTTPException(status_code=503, detail="Satellite data temporarily unavailable")
@@ -124,7 +125,7 @@ async def get_current_weather_data(
 ) -> Dict[str, Any]:
     """Get current weather conditions and marine forecast"""
     try:
-        weather_data = await environmental_service._collect_weather_data()
+        weather_data = await single_flight("weather/current", environmental_service._collect_weather_data)
         
         if not weather_data:
             raise HTTPException(status_code=503, detail="Weather data temporarily unavailable")
@@ -143,7 +144,7 @@ async def get_current_ocean_data(
 ) -> Dict[str, Any]:
     """Get current oceanographic data"""
     try:
-        ocean_data = await environmental_service._collect_ocean_data()
+        ocean_data = await single_flight("ocean/current", environmental_service._collect_ocean_data)
         
         if not ocean_data:
             raise HTTPException(status_code=503, detail="Ocean data temporarily unavailable")
@@ -159,7 +160,7 @@ async def get_current_ocean_data(
 @router.get("/quality/report")
 async def get_data_quality_report(
     current_user: dict = Depends(get_current_user_dependency),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Dict[str, Any]:
     """Get data quality report for all monitoring stations"""
     try:
@@ -181,7 +182,7 @@ async def trigger_data_collection(
     background_tasks: BackgroundTasks,
     station_id: Optional[str] = Query(None, description="Specific station ID to collect data for"),
     current_user: dict = Depends(get_current_user_dependency),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Dict[str, Any]:
     """Manually trigger environmental data collection"""
     try:
@@ -206,7 +207,7 @@ async def trigger_data_collection(
 @router.get("/summary")
 async def get_environmental_summary(
     current_user: dict = Depends(get_current_user_dependency),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Dict[str, Any]:
     """Get comprehensive environmental monitoring summary"""
     try:
@@ -279,7 +280,7 @@ async def get_environmental_summary(
 async def get_station_status(
     station_id: str,
     current_user: dict = Depends(get_current_user_dependency),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Dict[str, Any]:
     """Get detailed status for a specific monitoring station"""
     try:
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, Depends, Query, Body
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from app.routers.auth import get_current_user_dependency
@@ -24,6 +25,8 @@ async def get_flood_risk_forecast(
 ):
     """Get AI-powered flood risk assessment and forecast using LSTM model"""
     try:
+        now = datetime.utcnow()
+        
         # Get current environmental conditions (in production, fetch from sensors/APIs)
         current_conditions = {
             "tide_level": 1.5 + random.uniform(-0.5, 1.0),
@@ -50,7 +53,7 @@ async def get_flood_risk_forecast(
             current_conditions, hours=hours
         )
         
-        return RiskAssessment(
+        return ORJSONResponse(RiskAssessment(
             location=location,
             latitude=latitude,
             longitude=longitude,
@@ -58,8 +61,8 @@ async def get_flood_risk_forecast(
             flood_probability=flood_prediction["flood_probability"],
             storm_surge_risk=surge_forecast.get("risk_level", 0.3),
             wave_risk=wave_forecast.get("risk_level", 0.3),
-            assessment_time=datetime.utcnow(),
-            valid_until=datetime.utcnow() + timedelta(hours=hours),
+            assessment_time=now,
+            valid_until=now + timedelta(hours=hours),
             contributing_factors=[
                 f"Tide impact: {flood_prediction['factors'].get('tide_impact', 0):.2f}",
                 f"Wave impact: {flood_prediction['factors'].get('wave_impact', 0):.2f}",
@@ -67,7 +70,7 @@ async def get_flood_risk_forecast(
                 f"Rainfall: {flood_prediction['factors'].get('rainfall_impact', 0):.2f}",
                 f"Model confidence: {flood_prediction['confidence']:.2f}"
             ]
-        )
+        ))
         
     except Exception as e:
         logger.error(f"Error generating flood risk forecast for {location}: {e}")
@@ -91,11 +94,10 @@ async def get_advanced_flood_prediction(
         
         # Generate forecast timeline
         forecast_timeline = []
-        base_time = datetime.utcnow()
+        now = datetime.utcnow()
+        timestamps = [(now + timedelta(hours=i)).isoformat() for i in range(0, 48, 2)]  # 48-hour forecast, every 2 hours
         
-        for i in range(0, 48, 2):  # 48-hour forecast, every 2 hours
-            timestamp = base_time + timedelta(hours=i)
-            
+        for timestamp in timestamps:
             # Simulate changing conditions over time
             future_conditions = current_conditions.copy()
             future_conditions["tide_level"] += random.uniform(-0.3, 0.3)
@@ -104,7 +106,7 @@ async def get_advanced_flood_prediction(
             future_prediction = await ml_manager.flood_model.predict_flood_risk(future_conditions)
             
             forecast_timeline.append({
-                "timestamp": timestamp.isoformat(),
+                "timestamp": timestamp,
                 "flood_probability": future_prediction["flood_probability"],
                 "risk_level": future_prediction["risk_level"],
                 "confidence": future_prediction["confidence"]
@@ -174,16 +176,16 @@ async def get_tide_forecast(
     try:
         # Generate synthetic tide predictions
         predictions = []
-        base_time = datetime.utcnow()
+        now = datetime.utcnow()
         
         for i in range(0, hours, 2):  # Every 2 hours
-            timestamp = base_time + timedelta(hours=i)
+            timestamp = now + timedelta(hours=i)
             # Simulate tidal pattern with some randomness
             tide_level = 1.5 + 1.2 * random.sin(i * 0.26) + random.uniform(-0.3, 0.3)
             
             predictions.append({
-                "timestamp": timestamp.isoformat(),
-                "tide_level": round(tide_level, 2),
+                "timestamp": timestamp,
+                "value": round(tide_level, 2),
                 "confidence": random.uniform(0.8, 0.95)
             })
         
@@ -191,7 +193,7 @@ async def get_tide_forecast(
             location=location,
             forecast_type="tide",
             forecast_hours=hours,
-            generated_at=datetime.utcnow(),
+            generated_at=now,
             confidence=0.87,
             predictions=predictions
         )
@@ -209,6 +211,8 @@ async def get_storm_surge_forecast(
 ):
     """Get storm surge forecast and risk assessment"""
     try:
+        now = datetime.utcnow()
+        
         # Simulate storm surge prediction
         surge_risk = random.uniform(0.1, 0.8)
         max_surge_height = random.uniform(0.5, 3.0)
@@ -218,11 +222,11 @@ async def get_storm_surge_forecast(
             "coordinates": {"latitude": latitude, "longitude": longitude},
             "storm_surge_risk": surge_risk,
             "max_predicted_surge": max_surge_height,
-            "peak_surge_time": (datetime.utcnow() + timedelta(hours=random.randint(6, 18))).isoformat(),
+            "peak_surge_time": (now + timedelta(hours=random.randint(6, 18))).isoformat(),
             "duration_hours": random.randint(4, 12),
             "confidence": random.uniform(0.75, 0.92),
             "warning_level": "high" if surge_risk > 0.6 else "medium" if surge_risk > 0.3 else "low",
-            "generated_at": datetime.utcnow().isoformat()
+            "generated_at": now.isoformat()
         }
         
         return forecast_data
@@ -240,10 +244,10 @@ async def get_wave_height_forecast(
     """Get wave height forecast"""
     try:
         predictions = []
-        base_time = datetime.utcnow()
+        now = datetime.utcnow()
         
         for i in range(0, hours, 3):  # Every 3 hours
-            timestamp = base_time + timedelta(hours=i)
+            timestamp = now + timedelta(hours=i)
             # Simulate wave height with weather patterns
             wave_height = 1.0 + 0.8 * random.sin(i * 0.2) + random.uniform(-0.2, 0.4)
             wave_period = random.uniform(6, 12)
@@ -260,7 +264,7 @@ async def get_wave_height_forecast(
             "location": location,
             "forecast_type": "wave_height",
             "forecast_hours": hours,
-            "generated_at": datetime.utcnow().isoformat(),
+            "generated_at": now.isoformat(),
             "predictions": predictions,
             "model_info": {
                 "model_type": "LSTM Neural Network",
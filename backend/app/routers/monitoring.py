@@ -1,61 +1,194 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
-from typing import List, Optional
-from datetime import datetime, timedelta
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from app.utils.cache import swr_cache
+from app.utils.responses import MsgpackResponse
+from typing import Any, Callable, Dict, List, Optional, Tuple, get_args
+from datetime import datetime
+from itertools import islice
 from app.routers.auth import get_current_user_dependency
+from app.schemas.monitoring import (
+    AlgalBloomResponse,
+    CoastalErosionResponse,
+    EnvironmentalSummaryResponse,
+    SatelliteImageryResponse,
+    WaterQualityResponse
+)
+from app.schemas._types import (
+    BiodiversityTrend,
+    BloomType,
+    ContaminationLevel,
+    DiscolorationLevel,
+    EcosystemState,
+    Level,
+    NutrientLevel,
+    PollutionLevel,
+    QualityRating,
+    SewageLevel,
+    ShorelineState,
+    TemperatureTrend,
+    Trend
+)
+import numpy as np
+import orjson
 import logging
 
 logger = logging.getLogger(__name__)
-import random
 
 router = APIRouter()
 
-@router.get("/coastal-erosion/{location}")
+# Shared PCG64 generator; values are drawn in vectors rather than per field
+rng = np.random.default_rng()
+
+# Categorical options for simulated readings, indexed by rng.integers
+LEVELS = get_args(Level)
+TRENDS = get_args(Trend)
+BLOOM_TYPES = get_args(BloomType)
+NUTRIENT_LEVELS = get_args(NutrientLevel)
+RATINGS = get_args(QualityRating)
+CONTAMINATION_LEVELS = get_args(ContaminationLevel)
+SEWAGE_LEVELS = get_args(SewageLevel)
+DISCOLORATION_LEVELS = get_args(DiscolorationLevel)
+POLLUTION_LEVELS = get_args(PollutionLevel)
+ECOSYSTEM_STATES = get_args(EcosystemState)
+SHORELINE_STATES = get_args(ShorelineState)
+TEMPERATURE_TRENDS = get_args(TemperatureTrend)
+BIODIVERSITY_TRENDS = get_args(BiodiversityTrend)
+
+# Static parts of the environmental summary
+SUMMARY_RECOMMENDATIONS = (
+    "Continue regular monitoring",
+    "Implement erosion control measures",
+    "Monitor water quality closely",
+    "Protect marine habitats"
+)
+SUMMARY_DATA_SOURCES = (
+    "Sentinel-2 Satellite Imagery",
+    "NASA MODIS Ocean Color",
+    "In-situ Water Quality Sensors",
+    "Coastal Monitoring Stations"
+)
+
+# Cache TTLs in seconds, per endpoint
+EROSION_CACHE_TTL = 6 * 60 * 60
+ALGAL_BLOOM_CACHE_TTL = 15 * 60
+WATER_QUALITY_CACHE_TTL = 5 * 60
+SATELLITE_IMAGERY_CACHE_TTL = 6 * 60 * 60
+SUMMARY_CACHE_TTL = 60 * 60
+
+# Bulk endpoints also served as MessagePack when the client asks for it
+MSGPACK_ALTERNATES = {"application/msgpack": MsgpackResponse}
+MSGPACK_RESPONSES = {200: {"content": {"application/msgpack": {}}}}
+
+# Upper bound on the erosion history window (20 years)
+MAX_HISTORY_MONTHS = 240
+
+# Erosion history entries serialized per streamed chunk
+HISTORY_STREAM_BATCH_SIZE = 60
+
+def location_key_builder(
+    func: Callable,
+    namespace: str = "",
+    *,
+    request: Optional[Request] = None,
+    response: Optional[Response] = None,
+    args: Tuple[Any, ...] = (),
+    kwargs: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Build a cache key from the location parameters, rounding coordinates so jitter still hits"""
+    kwargs = kwargs or {}
+    key = ":".join(str(part) for part in (
+        request.url.path if request else func.__name__,
+        kwargs.get("location"),
+        round(kwargs.get("latitude", 0.0), 3),
+        round(kwargs.get("longitude", 0.0), 3),
+        kwargs.get("months"),
+        kwargs.get("analysis_type"),
+    ))
+    return f"{namespace}:{key}"
+
+@router.get("/coastal-erosion/{location}", response_model=CoastalErosionResponse)
+@swr_cache(
+    expire=EROSION_CACHE_TTL, namespace="erosion", key_builder=location_key_builder,
+    skip_if=lambda kwargs: kwargs.get("stream"), response_class=ORJSONResponse
+)
 async def get_coastal_erosion_data(
+    request: Request,
     location: str,
     latitude: float = Query(..., description="Latitude of location"),
     longitude: float = Query(..., description="Longitude of location"),
-    months: int = Query(12, description="Months of historical data"),
+    months: int = Query(12, ge=0, le=MAX_HISTORY_MONTHS, description="Months of historical data"),
+    stream: bool = Query(False, description="Stream the response as it is generated"),
     current_user: dict = Depends(get_current_user_dependency)
 ):
     """Get coastal erosion monitoring data from satellite imagery"""
     try:
+        # Draw all simulated values up front in vectorized batches
+        idx = rng.integers(0, (len(LEVELS), len(TRENDS)))
+        shoreline_retreat, erosion_rate, affected_coastline = rng.uniform(
+            (0.5, 0.2, 1.0), (5.0, 2.5, 10.0)
+        ).tolist()
+        historical_values = rng.uniform((-2.0, 0.0), (2.0, 15.0), size=(months, 2)).tolist()
+        now = np.datetime64(datetime.utcnow(), "s")
+        offsets = (np.arange(months) * 30).astype("timedelta64[D]")
+        historical_dates = np.datetime_as_string(now - offsets).tolist()
+        population_affected, economic_impact = rng.integers((0, 100000), (5001, 5000001)).tolist()
+        
         # Simulate Sentinel Hub satellite data
         erosion_data = {
             "location": location,
             "coordinates": {"latitude": latitude, "longitude": longitude},
             "monitoring_period_months": months,
             "data_source": "Sentinel-2 Satellite Imagery",
-            "analysis_date": datetime.utcnow().isoformat(),
+            "analysis_date": datetime.utcnow(),
             "erosion_metrics": {
-                "shoreline_retreat_meters": random.uniform(0.5, 5.0),
-                "erosion_rate_m_per_year": random.uniform(0.2, 2.5),
-                "affected_coastline_km": random.uniform(1.0, 10.0),
-                "severity": random.choice(["low", "medium", "high"]),
-                "trend": random.choice(["stable", "increasing", "decreasing"])
+                "shoreline_retreat_meters": shoreline_retreat,
+                "erosion_rate_m_per_year": erosion_rate,
+                "affected_coastline_km": affected_coastline,
+                "severity": LEVELS[idx[0]],
+                "trend": TRENDS[idx[1]]
             },
-            "historical_changes": [
-                {
-                    "date": (datetime.utcnow() - timedelta(days=30*i)).isoformat(),
-                    "shoreline_position": random.uniform(-2.0, 2.0),
-                    "vegetation_loss_percent": random.uniform(0, 15)
-                }
-                for i in range(months)
-            ],
             "risk_assessment": {
-                "infrastructure_at_risk": random.choice([True, False]),
-                "population_affected": random.randint(0, 5000),
-                "economic_impact_estimate": random.randint(100000, 5000000)
+                "infrastructure_at_risk": bool(rng.integers(0, 2)),
+                "population_affected": population_affected,
+                "economic_impact_estimate": economic_impact
             }
         }
+        historical_changes = (
+            {
+                "date": date,
+                "shoreline_position": shoreline_position,
+                "vegetation_loss_percent": vegetation_loss
+            }
+            for date, (shoreline_position, vegetation_loss) in zip(historical_dates, historical_values)
+        )
+        
+        if stream:
+            async def generate():
+                # Reopen the serialized object and append historical_changes element by element
+                yield orjson.dumps(erosion_data)[:-1] + b',"historical_changes":['
+                separator = b""
+                # One orjson call and one body chunk per batch rather than per element
+                while batch := list(islice(historical_changes, HISTORY_STREAM_BATCH_SIZE)):
+                    yield separator + orjson.dumps(batch)[1:-1]
+                    separator = b","
+                yield b"]}"
+            
+            return StreamingResponse(generate(), media_type="application/json")
         
+        erosion_data["historical_changes"] = list(historical_changes)
         return erosion_data
         
     except Exception as e:
-        logger.error(f"Error fetching coastal erosion data for {location}: {e}")
+        logger.error("Error fetching coastal erosion data for %s", location, exc_info=e)
         raise HTTPException(status_code=500, detail="Failed to fetch coastal erosion data")
 
-@router.get("/algal-blooms/{location}")
+@router.get("/algal-blooms/{location}", response_model=AlgalBloomResponse)
+@swr_cache(
+    expire=ALGAL_BLOOM_CACHE_TTL, namespace="algal-blooms", key_builder=location_key_builder,
+    response_class=ORJSONResponse
+)
 async def get_algal_bloom_data(
+    request: Request,
     location: str,
     latitude: float = Query(..., description="Latitude of location"),
     longitude: float = Query(..., description="Longitude of location"),
@@ -64,42 +197,52 @@ async def get_algal_bloom_data(
     """Get harmful algal bloom detection data from NASA Earthdata"""
     try:
         # Simulate NASA OceanColor data
-        bloom_detected = random.choice([True, False])
+        idx = rng.integers(0, (len(LEVELS), len(BLOOM_TYPES), len(LEVELS), len(NUTRIENT_LEVELS)))
+        bloom_detected = bool(rng.integers(0, 2))
+        chlorophyll_max = 50.0 if bloom_detected else 2.0
+        chlorophyll, bloom_area, sea_surface_temperature, water_turbidity = rng.uniform(
+            (0.1, 10, 24, 1), (chlorophyll_max, 500, 32, 10)
+        ).tolist()
         
         bloom_data = {
             "location": location,
             "coordinates": {"latitude": latitude, "longitude": longitude},
             "data_source": "NASA MODIS-Aqua OceanColor",
-            "observation_date": datetime.utcnow().isoformat(),
+            "observation_date": datetime.utcnow(),
             "bloom_detected": bloom_detected,
             "bloom_metrics": {
-                "chlorophyll_concentration": random.uniform(0.1, 50.0) if bloom_detected else random.uniform(0.1, 2.0),
-                "bloom_area_km2": random.uniform(10, 500) if bloom_detected else 0,
-                "bloom_intensity": random.choice(["low", "medium", "high"]) if bloom_detected else "none",
-                "bloom_type": random.choice(["red_tide", "blue_green", "brown_tide"]) if bloom_detected else None,
-                "toxicity_level": random.choice(["low", "medium", "high"]) if bloom_detected else "none"
+                "chlorophyll_concentration": chlorophyll,
+                "bloom_area_km2": bloom_area if bloom_detected else 0,
+                "bloom_intensity": LEVELS[idx[0]] if bloom_detected else "none",
+                "bloom_type": BLOOM_TYPES[idx[1]] if bloom_detected else None,
+                "toxicity_level": LEVELS[idx[2]] if bloom_detected else "none"
             },
             "health_advisory": {
                 "swimming_advisory": "avoid" if bloom_detected else "safe",
                 "fishing_advisory": "caution" if bloom_detected else "safe",
                 "water_contact_warning": bloom_detected,
-                "expected_duration_days": random.randint(3, 14) if bloom_detected else 0
+                "expected_duration_days": int(rng.integers(3, 15)) if bloom_detected else 0
             },
             "environmental_conditions": {
-                "sea_surface_temperature": random.uniform(24, 32),
-                "nutrient_levels": random.choice(["normal", "elevated", "high"]),
-                "water_turbidity": random.uniform(1, 10)
+                "sea_surface_temperature": sea_surface_temperature,
+                "nutrient_levels": NUTRIENT_LEVELS[idx[3]],
+                "water_turbidity": water_turbidity
             }
         }
         
         return bloom_data
         
     except Exception as e:
-        logger.error(f"Error fetching algal bloom data for {location}: {e}")
+        logger.error("Error fetching algal bloom data for %s", location, exc_info=e)
         raise HTTPException(status_code=500, detail="Failed to fetch algal bloom data")
 
-@router.get("/water-quality/{location}")
+@router.get("/water-quality/{location}", response_model=WaterQualityResponse)
+@swr_cache(
+    expire=WATER_QUALITY_CACHE_TTL, namespace="water-quality", key_builder=location_key_builder,
+    response_class=ORJSONResponse
+)
 async def get_water_quality_data(
+    request: Request,
     location: str,
     latitude: float = Query(..., description="Latitude of location"),
     longitude: float = Query(..., description="Longitude of location"),
@@ -107,46 +250,94 @@ async def get_water_quality_data(
 ):
     """Get water quality monitoring data"""
     try:
+        idx = rng.integers(0, (len(RATINGS), len(LEVELS), len(CONTAMINATION_LEVELS), len(SEWAGE_LEVELS)))
+        (ph_level, dissolved_oxygen, turbidity, salinity,
+         temperature, nitrate, phosphate) = rng.uniform(
+            (7.5, 6.0, 1.0, 30.0, 24.0, 0.1, 0.01),
+            (8.5, 9.0, 15.0, 37.0, 32.0, 2.0, 0.5)
+        ).tolist()
+        bacteria_count, overall_score = rng.integers((10, 60), (1001, 96)).tolist()
+        safe_for_recreation, safe_for_marine_life, oil_spill_detected = (rng.random(3) < 0.5).tolist()
+        
         water_quality = {
             "location": location,
             "coordinates": {"latitude": latitude, "longitude": longitude},
-            "measurement_date": datetime.utcnow().isoformat(),
+            "measurement_date": datetime.utcnow(),
             "parameters": {
-                "ph_level": random.uniform(7.5, 8.5),
-                "dissolved_oxygen_mg_l": random.uniform(6.0, 9.0),
-                "turbidity_ntu": random.uniform(1.0, 15.0),
-                "salinity_ppt": random.uniform(30.0, 37.0),
-                "temperature_celsius": random.uniform(24.0, 32.0),
-                "nitrate_mg_l": random.uniform(0.1, 2.0),
-                "phosphate_mg_l": random.uniform(0.01, 0.5),
-                "bacteria_count_cfu_100ml": random.randint(10, 1000)
+                "ph_level": ph_level,
+                "dissolved_oxygen_mg_l": dissolved_oxygen,
+                "turbidity_ntu": turbidity,
+                "salinity_ppt": salinity,
+                "temperature_celsius": temperature,
+                "nitrate_mg_l": nitrate,
+                "phosphate_mg_l": phosphate,
+                "bacteria_count_cfu_100ml": bacteria_count
             },
             "quality_index": {
-                "overall_score": random.randint(60, 95),
-                "rating": random.choice(["excellent", "good", "fair", "poor"]),
-                "safe_for_recreation": random.choice([True, False]),
-                "safe_for_marine_life": random.choice([True, False])
+                "overall_score": overall_score,
+                "rating": RATINGS[idx[0]],
+                "safe_for_recreation": safe_for_recreation,
+                "safe_for_marine_life": safe_for_marine_life
             },
             "pollution_indicators": {
-                "oil_spill_detected": random.choice([True, False]),
-                "plastic_debris_level": random.choice(["low", "medium", "high"]),
-                "chemical_contamination": random.choice(["none", "trace", "moderate"]),
-                "sewage_indicators": random.choice(["absent", "present", "high"])
+                "oil_spill_detected": oil_spill_detected,
+                "plastic_debris_level": LEVELS[idx[1]],
+                "chemical_contamination": CONTAMINATION_LEVELS[idx[2]],
+                "sewage_indicators": SEWAGE_LEVELS[idx[3]]
             }
         }
         
         return water_quality
         
     except Exception as e:
-        logger.error(f"Error fetching water quality data for {location}: {e}")
+        logger.error("Error fetching water quality data for %s", location, exc_info=e)
         raise HTTPException(status_code=500, detail="Failed to fetch water quality data")
 
-@router.get("/satellite-imagery/{location}")
+def _build_erosion_section(results: Dict[str, Any], rng: np.random.Generator):
+    shoreline_change, vegetation_loss = rng.uniform((-3.0, 0), (1.0, 25)).tolist()
+    results["coastal_erosion"] = {
+        "shoreline_change_m": shoreline_change,
+        "erosion_hotspots": int(rng.integers(0, 6)),
+        "vegetation_loss_percent": vegetation_loss
+    }
+
+def _build_pollution_section(results: Dict[str, Any], rng: np.random.Generator):
+    results["pollution_detection"] = {
+        "oil_slick_detected": bool(rng.integers(0, 2)),
+        "sediment_plume_area_km2": float(rng.uniform(0, 50)),
+        "water_discoloration": DISCOLORATION_LEVELS[rng.integers(0, len(DISCOLORATION_LEVELS))]
+    }
+
+def _build_vegetation_section(results: Dict[str, Any], rng: np.random.Generator):
+    ndvi_average, mangrove_coverage = rng.uniform((0.2, 0), (0.8, 100)).tolist()
+    results["vegetation_health"] = {
+        "ndvi_average": ndvi_average,
+        "mangrove_coverage_km2": mangrove_coverage,
+        "vegetation_stress_level": LEVELS[rng.integers(0, len(LEVELS))]
+    }
+
+# analysis_type -> section builders that fill in analysis_results
+IMAGERY_SECTION_BUILDERS = {
+    "erosion": (_build_erosion_section,),
+    "pollution": (_build_pollution_section,),
+    "vegetation": (_build_vegetation_section,),
+    "all": (_build_erosion_section, _build_pollution_section, _build_vegetation_section),
+}
+
+@router.get("/satellite-imagery/{location}", response_model=SatelliteImageryResponse, responses=MSGPACK_RESPONSES)
+@swr_cache(
+    expire=SATELLITE_IMAGERY_CACHE_TTL, namespace="satellite-imagery", key_builder=location_key_builder,
+    response_class=ORJSONResponse, alternates=MSGPACK_ALTERNATES
+)
 async def get_satellite_imagery_analysis(
+    request: Request,
     location: str,
     latitude: float = Query(..., description="Latitude of location"),
     longitude: float = Query(..., description="Longitude of location"),
-    analysis_type: str = Query("all", description="Analysis type: erosion, pollution, vegetation, all"),
+    analysis_type: str = Query(
+        "all", pattern="^(erosion|pollution|vegetation|all)$",
+        description="Analysis type: erosion, pollution, vegetation, all"
+    ),
     current_user: dict = Depends(get_current_user_dependency)
 ):
     """Get satellite imagery analysis results"""
@@ -154,42 +345,29 @@ async def get_satellite_imagery_analysis(
         imagery_analysis = {
             "location": location,
             "coordinates": {"latitude": latitude, "longitude": longitude},
-            "analysis_date": datetime.utcnow().isoformat(),
+            "analysis_date": datetime.utcnow(),
             "satellite_source": "Sentinel-2, Landsat-8",
             "image_resolution_meters": 10,
-            "cloud_cover_percent": random.uniform(0, 30),
+            "cloud_cover_percent": float(rng.uniform(0, 30)),
             "analysis_results": {}
         }
         
-        if analysis_type in ["erosion", "all"]:
-            imagery_analysis["analysis_results"]["coastal_erosion"] = {
-                "shoreline_change_m": random.uniform(-3.0, 1.0),
-                "erosion_hotspots": random.randint(0, 5),
-                "vegetation_loss_percent": random.uniform(0, 25)
-            }
-        
-        if analysis_type in ["pollution", "all"]:
-            imagery_analysis["analysis_results"]["pollution_detection"] = {
-                "oil_slick_detected": random.choice([True, False]),
-                "sediment_plume_area_km2": random.uniform(0, 50),
-                "water_discoloration": random.choice(["none", "mild", "severe"])
-            }
-        
-        if analysis_type in ["vegetation", "all"]:
-            imagery_analysis["analysis_results"]["vegetation_health"] = {
-                "ndvi_average": random.uniform(0.2, 0.8),
-                "mangrove_coverage_km2": random.uniform(0, 100),
-                "vegetation_stress_level": random.choice(["low", "medium", "high"])
-            }
+        for build_section in IMAGERY_SECTION_BUILDERS[analysis_type]:
+            build_section(imagery_analysis["analysis_results"], rng)
         
         return imagery_analysis
         
     except Exception as e:
-        logger.error(f"Error performing satellite imagery analysis for {location}: {e}")
+        logger.error("Error performing satellite imagery analysis for %s", location, exc_info=e)
         raise HTTPException(status_code=500, detail="Failed to perform satellite imagery analysis")
 
-@router.get("/environmental-summary/{location}")
+@router.get("/environmental-summary/{location}", response_model=EnvironmentalSummaryResponse, responses=MSGPACK_RESPONSES)
+@swr_cache(
+    expire=SUMMARY_CACHE_TTL, namespace="environmental-summary", key_builder=location_key_builder,
+    response_class=ORJSONResponse, alternates=MSGPACK_ALTERNATES
+)
 async def get_environmental_summary(
+    request: Request,
     location: str,
     latitude: float = Query(..., description="Latitude of location"),
     longitude: float = Query(..., description="Longitude of location"),
@@ -197,39 +375,34 @@ async def get_environmental_summary(
 ):
     """Get comprehensive environmental monitoring summary"""
     try:
+        idx = rng.integers(0, (
+            len(RATINGS), len(LEVELS), len(RATINGS), len(LEVELS), len(POLLUTION_LEVELS),
+            len(ECOSYSTEM_STATES), len(SHORELINE_STATES), len(TEMPERATURE_TRENDS), len(BIODIVERSITY_TRENDS)
+        ))
+        
         summary = {
             "location": location,
             "coordinates": {"latitude": latitude, "longitude": longitude},
-            "summary_date": datetime.utcnow().isoformat(),
-            "overall_environmental_health": random.choice(["excellent", "good", "fair", "poor"]),
+            "summary_date": datetime.utcnow(),
+            "overall_environmental_health": RATINGS[idx[0]],
             "key_indicators": {
-                "coastal_erosion_risk": random.choice(["low", "medium", "high"]),
-                "water_quality_status": random.choice(["excellent", "good", "fair", "poor"]),
-                "algal_bloom_risk": random.choice(["low", "medium", "high"]),
-                "pollution_level": random.choice(["minimal", "moderate", "high"]),
-                "ecosystem_health": random.choice(["thriving", "stable", "stressed", "degraded"])
+                "coastal_erosion_risk": LEVELS[idx[1]],
+                "water_quality_status": RATINGS[idx[2]],
+                "algal_bloom_risk": LEVELS[idx[3]],
+                "pollution_level": POLLUTION_LEVELS[idx[4]],
+                "ecosystem_health": ECOSYSTEM_STATES[idx[5]]
             },
             "recent_changes": {
-                "shoreline_stability": random.choice(["stable", "retreating", "advancing"]),
-                "water_temperature_trend": random.choice(["stable", "warming", "cooling"]),
-                "biodiversity_trend": random.choice(["increasing", "stable", "declining"])
+                "shoreline_stability": SHORELINE_STATES[idx[6]],
+                "water_temperature_trend": TEMPERATURE_TRENDS[idx[7]],
+                "biodiversity_trend": BIODIVERSITY_TRENDS[idx[8]]
             },
-            "recommendations": [
-                "Continue regular monitoring",
-                "Implement erosion control measures",
-                "Monitor water quality closely",
-                "Protect marine habitats"
-            ],
-            "data_sources": [
-                "Sentinel-2 Satellite Imagery",
-                "NASA MODIS Ocean Color",
-                "In-situ Water Quality Sensors",
-                "Coastal Monitoring Stations"
-            ]
+            "recommendations": SUMMARY_RECOMMENDATIONS,
+            "data_sources": SUMMARY_DATA_SOURCES
         }
         
         return summary
         
     except Exception as e:
-        logger.error(f"Error generating environmental summary for {location}: {e}")
+        logger.error("Error generating environmental summary for %s", location, exc_info=e)
         raise HTTPException(status_code=500, detail="Failed to generate environmental summary")
\ No newline at end of file
@@ -1,113 +1,167 @@
-from fastapi import APIRouter, HTTPException, Depends, Body
-from typing import Dict, List, Optional, Any
+from fastapi import APIRouter, HTTPException, Depends, Body, BackgroundTasks, Request
+from typing import Annotated, Dict, List, Optional, Any
 from datetime import datetime
 from app.routers.auth import get_current_user_dependency
 from app.services.notification_service import notification_service
-from app.database import get_db
-from sqlalchemy.orm import Session
+from app.database import SessionLocal, get_async_db
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.user import User, UserPreferences
 from app.models.alert import AlertNotification
-from pydantic import BaseModel, Field
+from app.utils.msgspec_body import msgspec_body, msgspec_openapi
 from loguru import logger
-import uuid
+from uuid_extensions import uuid7str
+from cachetools import TTLCache
+import asyncio
+import json
+import msgspec
 
 router = APIRouter()
 
-# Pydantic models for request/response
-class NotificationPreferences(BaseModel):
-    email_enabled: bool = Field(True, description="Enable email notifications")
-    sms_enabled: bool = Field(False, description="Enable SMS notifications")
-    push_enabled: bool = Field(True, description="Enable push notifications")
-    phone_number: Optional[str] = Field(None, description="Phone number for SMS")
-    device_token: Optional[str] = Field(None, description="Device token for push notifications")
-    alert_types: List[str] = Field(["flood", "storm_surge", "high_waves"], description="Alert types to receive")
-    severity_threshold: str = Field("medium", description="Minimum severity level")
-    quiet_hours_start: Optional[str] = Field(None, description="Quiet hours start (HH:MM)")
-    quiet_hours_end: Optional[str] = Field(None, description="Quiet hours end (HH:MM)")
+# How long test notification results stay available for polling, in seconds
+TEST_RESULT_TTL = 300
 
-class TestNotificationRequest(BaseModel):
-    notification_type: str = Field(..., description="Type: email, sms, push, or all")
-    message: Optional[str] = Field("Test notification from Coastal Alert System", description="Custom test message")
+# Per-worker cache of rendered preferences, evicted across workers via Redis pub/sub
+_PREFS_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+PREFS_INVALIDATION_CHANNEL = "prefs:invalidate"
+# Reconnect backoff for the invalidation listener, in seconds
+PREFS_LISTENER_MIN_BACKOFF = 1
+PREFS_LISTENER_MAX_BACKOFF = 60
 
-class NotificationHistoryResponse(BaseModel):
-    id: str
-    alert_id: Optional[str]
-    notification_method: str
-    recipient: str
-    subject: Optional[str]
-    status: str
-    sent_at: Optional[datetime]
-    delivered_at: Optional[datetime]
-    error_message: Optional[str]
+DEFAULT_ALERT_TYPES = ("flood", "storm_surge", "high_waves")
+
+# Columns read by the history endpoint; selected as plain rows to skip ORM hydration
+HISTORY_COLUMNS = (
+    AlertNotification.id,
+    AlertNotification.alert_id,
+    AlertNotification.notification_method,
+    AlertNotification.recipient,
+    AlertNotification.subject,
+    AlertNotification.status,
+    AlertNotification.sent_at,
+    AlertNotification.delivered_at,
+    AlertNotification.error_message
+)
+
+# Preferences returned for users who have not saved any; copied per request
+DEFAULT_PREFS = {
+    "email_enabled": True,
+    "sms_enabled": False,
+    "push_enabled": True,
+    "phone_number": None,
+    "device_token": None,
+    "alert_types": DEFAULT_ALERT_TYPES,
+    "severity_threshold": "medium",
+    "quiet_hours_start": None,
+    "quiet_hours_end": None
+}
+
+async def _invalidate_preferences(redis, user_id: str):
+    """Evict a user's cached preferences here and tell the other workers to do the same"""
+    _PREFS_CACHE.pop(user_id, None)
+    try:
+        await redis.publish(PREFS_INVALIDATION_CHANNEL, user_id)
+    except Exception as e:
+        logger.opt(exception=e).error("Error publishing preferences invalidation")
+
+async def listen_for_preference_invalidations(redis):
+    """Evict cached preferences named on the invalidation channel; runs for the app lifetime"""
+    delay = PREFS_LISTENER_MIN_BACKOFF
+    while True:
+        pubsub = redis.pubsub()
+        try:
+            await pubsub.subscribe(PREFS_INVALIDATION_CHANNEL)
+            delay = PREFS_LISTENER_MIN_BACKOFF
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    user_id = message["data"]
+                    _PREFS_CACHE.pop(user_id.decode() if isinstance(user_id, bytes) else user_id, None)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.opt(exception=e).error("Preferences invalidation listener failed, retrying in {}s", delay)
+            # Drop entries that may have missed an invalidation while disconnected
+            _PREFS_CACHE.clear()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, PREFS_LISTENER_MAX_BACKOFF)
+        finally:
+            try:
+                await pubsub.close()
+            except Exception as e:
+                logger.opt(exception=e).warning("Error closing preferences invalidation subscription")
+
+# msgspec structs for request/response
+class NotificationPreferences(msgspec.Struct):
+    email_enabled: Annotated[bool, msgspec.Meta(description="Enable email notifications")] = True
+    sms_enabled: Annotated[bool, msgspec.Meta(description="Enable SMS notifications")] = False
+    push_enabled: Annotated[bool, msgspec.Meta(description="Enable push notifications")] = True
+    phone_number: Annotated[Optional[str], msgspec.Meta(description="Phone number for SMS")] = None
+    device_token: Annotated[Optional[str], msgspec.Meta(description="Device token for push notifications")] = None
+    alert_types: Annotated[List[str], msgspec.Meta(description="Alert types to receive")] = msgspec.field(
+        default_factory=lambda: list(DEFAULT_ALERT_TYPES)
+    )
+    severity_threshold: Annotated[str, msgspec.Meta(description="Minimum severity level")] = "medium"
+    quiet_hours_start: Annotated[Optional[str], msgspec.Meta(description="Quiet hours start (HH:MM)")] = None
+    quiet_hours_end: Annotated[Optional[str], msgspec.Meta(description="Quiet hours end (HH:MM)")] = None
+
+class TestNotificationRequest(msgspec.Struct):
+    notification_type: Annotated[str, msgspec.Meta(description="Type: email, sms, push, or all")]
+    message: Annotated[Optional[str], msgspec.Meta(description="Custom test message")] = "Test notification from Coastal Alert System"
 
 @router.get("/preferences")
 async def get_notification_preferences(
     current_user: dict = Depends(get_current_user_dependency),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get user's notification preferences"""
     try:
         user_id = current_user["id"]
         
+        cached = _PREFS_CACHE.get(user_id)
+        if cached is not None:
+            return cached
+        
         # Get user preferences
-        preferences = db.query(UserPreferences).filter(
-            UserPreferences.user_id == user_id
-        ).first()
+        preferences = await db.scalar(
+            select(UserPreferences).where(UserPreferences.user_id == user_id)
+        )
         
         if not preferences:
-            # Return default preferences
-            return {
-                "email_enabled": True,
-                "sms_enabled": False,
-                "push_enabled": True,
-                "phone_number": None,
-                "device_token": None,
-                "alert_types": ["flood", "storm_surge", "high_waves"],
-                "severity_threshold": "medium",
-                "quiet_hours_start": None,
-                "quiet_hours_end": None
-            }
+            # Return default preferences; cached too, the upsert invalidates the entry
+            _PREFS_CACHE[user_id] = result = dict(DEFAULT_PREFS)
+            return result
         
-        notification_methods = preferences.notification_methods or []
+        notification_methods = set(preferences.notification_methods or ())
         
-        return {
+        _PREFS_CACHE[user_id] = result = {
             "email_enabled": "email" in notification_methods,
             "sms_enabled": "sms" in notification_methods,
             "push_enabled": "push" in notification_methods,
             "phone_number": preferences.phone_number,
             "device_token": getattr(preferences, 'device_token', None),
-            "alert_types": preferences.alert_types or ["flood", "storm_surge", "high_waves"],
+            "alert_types": preferences.alert_types or DEFAULT_ALERT_TYPES,
             "severity_threshold": preferences.severity_threshold or "medium",
             "quiet_hours_start": preferences.quiet_hours_start,
             "quiet_hours_end": preferences.quiet_hours_end
         }
+        return result
         
     except Exception as e:
-        logger.error(f"Error getting notification preferences: {e}")
+        logger.opt(exception=e).error("Error getting notification preferences")
         raise HTTPException(status_code=500, detail="Failed to get notification preferences")
 
-@router.put("/preferences")
+@router.put("/preferences", openapi_extra=msgspec_openapi(NotificationPreferences))
 async def update_notification_preferences(
-    preferences: NotificationPreferences,
+    request: Request,
+    preferences: NotificationPreferences = Depends(msgspec_body(NotificationPreferences)),
     current_user: dict = Depends(get_current_user_dependency),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update user's notification preferences"""
     try:
         user_id = current_user["id"]
         
-        # Get or create user preferences
-        user_prefs = db.query(UserPreferences).filter(
-            UserPreferences.user_id == user_id
-        ).first()
-        
-        if not user_prefs:
-            user_prefs = UserPreferences(
-                id=str(uuid.uuid4()),
-                user_id=user_id
-            )
-            db.add(user_prefs)
-        
         # Build notification methods list
         notification_methods = []
         if preferences.email_enabled:
@@ -117,22 +171,32 @@ async def update_notification_preferences(
         if preferences.push_enabled:
             notification_methods.append("push")
         
-        # Update preferences
-        user_prefs.notification_methods = notification_methods
-        user_prefs.phone_number = preferences.phone_number
-        user_prefs.alert_types = preferences.alert_types
-        user_prefs.severity_threshold = preferences.severity_threshold
-        user_prefs.quiet_hours_start = preferences.quiet_hours_start
-        user_prefs.quiet_hours_end = preferences.quiet_hours_end
-        user_prefs.updated_at = datetime.utcnow()
+        # Create or update preferences in a single upsert
+        values = {
+            "notification_methods": notification_methods,
+            "phone_number": preferences.phone_number,
+            "alert_types": preferences.alert_types,
+            "severity_threshold": preferences.severity_threshold,
+            "quiet_hours_start": preferences.quiet_hours_start,
+            "quiet_hours_end": preferences.quiet_hours_end,
+            "updated_at": datetime.utcnow()
+        }
+        await db.execute(
+            pg_insert(UserPreferences).values(
+                id=uuid7str(), user_id=user_id, **values
+            ).on_conflict_do_update(
+                index_elements=[UserPreferences.user_id], set_=values
+            )
+        )
         
         # Update device token if provided
         if preferences.device_token:
-            user = db.query(User).filter(User.id == user_id).first()
-            if user:
-                user.device_token = preferences.device_token
+            await db.execute(
+                update(User).where(User.id == user_id).values(device_token=preferences.device_token)
+            )
         
-        db.commit()
+        await db.commit()
+        await _invalidate_preferences(request.app.state.redis, user_id)
         
         return {
             "success": True,
@@ -147,72 +211,136 @@ async def update_notification_preferences(
         }
         
     except Exception as e:
-        logger.error(f"Error updating notification preferences: {e}")
-        db.rollback()
+        logger.opt(exception=e).error("Error updating notification preferences")
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Failed to update notification preferences")
 
-@router.post("/test")
+def _test_result_key(user_id: str, task_id: str) -> str:
+    return f"notification-test:{user_id}:{task_id}"
+
+async def _run_test_notification(
+    redis, user_id: str, notification_type: str, message: Optional[str], task_id: str
+):
+    """Send a test notification outside the request and store its result for polling"""
+    # The request-scoped session is closed by now, so open a dedicated one
+    db = SessionLocal()
+    try:
+        result = await notification_service.send_test_notification(
+            user_id, notification_type, db, message
+        )
+        status = "completed"
+    except Exception as e:
+        logger.opt(exception=e).error("Error sending test notification")
+        result = {"success": False, "error": "Failed to send test notification"}
+        status = "failed"
+    finally:
+        db.close()
+    
+    await redis.set(
+        _test_result_key(user_id, task_id),
+        json.dumps({"task_id": task_id, "status": status, "details": result}, default=str),
+        ex=TEST_RESULT_TTL
+    )
+
+@router.post("/test", status_code=202, openapi_extra=msgspec_openapi(TestNotificationRequest))
 async def test_notification(
-    test_request: TestNotificationRequest,
-    current_user: dict = Depends(get_current_user_dependency),
-    db: Session = Depends(get_db)
+    request: Request,
+    background_tasks: BackgroundTasks,
+    test_request: TestNotificationRequest = Depends(msgspec_body(TestNotificationRequest)),
+    current_user: dict = Depends(get_current_user_dependency)
 ):
-    """Send a test notification to verify settings"""
+    """Queue a test notification to verify settings"""
     try:
         user_id = current_user["id"]
+        task_id = uuid7str()
+        redis = request.app.state.redis
         
-        # Send test notification
-        result = await notification_service.send_test_notification(
-            user_id, test_request.notification_type, test_request.message, db
+        await redis.set(
+            _test_result_key(user_id, task_id),
+            json.dumps({"task_id": task_id, "status": "pending"}),
+            ex=TEST_RESULT_TTL
+        )
+        background_tasks.add_task(
+            _run_test_notification, redis, user_id,
+            test_request.notification_type, test_request.message, task_id
         )
         
         return {
-            "success": result.get("success", False),
-            "message": "Test notification sent" if result.get("success") else "Test notification failed",
-            "details": result
+            "accepted": True,
+            "task_id": task_id
         }
         
     except Exception as e:
-        logger.error(f"Error sending test notification: {e}")
+        logger.opt(exception=e).error("Error queueing test notification")
         raise HTTPException(status_code=500, detail="Failed to send test notification")
 
+@router.get("/test/{task_id}")
+async def get_test_notification_result(
+    task_id: str,
+    request: Request,
+    current_user: dict = Depends(get_current_user_dependency)
+):
+    """Get the result of a queued test notification"""
+    try:
+        cached = await request.app.state.redis.get(_test_result_key(current_user["id"], task_id))
+    except Exception as e:
+        logger.opt(exception=e).error("Error getting test notification result")
+        raise HTTPException(status_code=500, detail="Failed to get test notification result")
+    
+    if cached is None:
+        raise HTTPException(status_code=404, detail="Test notification not found")
+    
+    return json.loads(cached)
+
 @router.get("/history")
 async def get_notification_history(
     limit: int = 50,
     offset: int = 0,
     current_user: dict = Depends(get_current_user_dependency),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get user's notification history"""
     try:
         user_id = current_user["id"]
         
-        # Get notification history
-        notifications = db.query(AlertNotification).filter(
-            AlertNotification.user_id == user_id
-        ).order_by(
-            AlertNotification.sent_at.desc()
-        ).offset(offset).limit(limit).all()
+        # Get notification history with the total count in the same roundtrip
+        total_col = func.count().over().label("total_count")
+        result = await db.execute(
+            select(*HISTORY_COLUMNS, total_col).where(
+                AlertNotification.user_id == user_id
+            ).order_by(
+                AlertNotification.sent_at.desc()
+            ).offset(offset).limit(limit)
+        )
+        rows = result.all()
+        
+        if offset == 0 and len(rows) < limit:
+            total_count = len(rows)
+        elif rows:
+            total_count = rows[0].total_count
+        else:
+            # Offset past the end; the window has no rows to report on
+            total_count = await db.scalar(
+                select(func.count(AlertNotification.id)).where(
+                    AlertNotification.user_id == user_id
+                )
+            )
         
         # Convert to response format
-        history = []
-        for notification in notifications:
-            history.append({
-                "id": notification.id,
-                "alert_id": notification.alert_id,
-                "notification_method": notification.notification_method,
-                "recipient": notification.recipient,
-                "subject": notification.subject,
-                "status": notification.status,
-                "sent_at": notification.sent_at.isoformat() if notification.sent_at else None,
-                "delivered_at": notification.delivered_at.isoformat() if notification.delivered_at else None,
-                "error_message": notification.error_message
-            })
-        
-        # Get total count
-        total_count = db.query(AlertNotification).filter(
-            AlertNotification.user_id == user_id
-        ).count()
+        history = [
+            {
+                "id": row.id,
+                "alert_id": row.alert_id,
+                "notification_method": row.notification_method,
+                "recipient": row.recipient,
+                "subject": row.subject,
+                "status": row.status,
+                "sent_at": row.sent_at.isoformat() if row.sent_at else None,
+                "delivered_at": row.delivered_at.isoformat() if row.delivered_at else None,
+                "error_message": row.error_message
+            }
+            for row in rows
+        ]
         
         return {
             "notifications": history,
@@ -222,70 +350,61 @@ async def get_notification_history(
         }
         
     except Exception as e:
-        logger.error(f"Error getting notification history: {e}")
+        logger.opt(exception=e).error("Error getting notification history")
         raise HTTPException(status_code=500, detail="Failed to get notification history")
 
 @router.get("/stats")
 async def get_notification_stats(
     current_user: dict = Depends(get_current_user_dependency),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get notification statistics for the user"""
     try:
         user_id = current_user["id"]
         
-        # Get notification statistics
-        total_notifications = db.query(AlertNotification).filter(
-            AlertNotification.user_id == user_id
-        ).count()
-        
-        successful_notifications = db.query(AlertNotification).filter(
-            AlertNotification.user_id == user_id,
-            AlertNotification.status == "sent"
-        ).count()
+        # Get notification statistics in a single grouped aggregation
+        result = await db.execute(
+            select(
+                AlertNotification.status,
+                AlertNotification.notification_method,
+                func.count().label("n")
+            ).where(
+                AlertNotification.user_id == user_id
+            ).group_by(
+                AlertNotification.status,
+                AlertNotification.notification_method
+            )
+        )
+        rows = result.all()
         
-        failed_notifications = db.query(AlertNotification).filter(
-            AlertNotification.user_id == user_id,
-            AlertNotification.status == "failed"
-        ).count()
+        total_notifications = sum(row.n for row in rows)
+        successful_notifications = sum(row.n for row in rows if row.status == "sent")
+        failed_notifications = sum(row.n for row in rows if row.status == "failed")
         
         # Get notifications by method
-        email_count = db.query(AlertNotification).filter(
-            AlertNotification.user_id == user_id,
-            AlertNotification.notification_method == "email"
-        ).count()
-        
-        sms_count = db.query(AlertNotification).filter(
-            AlertNotification.user_id == user_id,
-            AlertNotification.notification_method == "sms"
-        ).count()
-        
-        push_count = db.query(AlertNotification).filter(
-            AlertNotification.user_id == user_id,
-            AlertNotification.notification_method == "push"
-        ).count()
+        by_method = {method: 0 for method in ("email", "sms", "push")}
+        for row in rows:
+            if row.notification_method in by_method:
+                by_method[row.notification_method] += row.n
         
         return {
             "total_notifications": total_notifications,
             "successful_notifications": successful_notifications,
             "failed_notifications": failed_notifications,
             "success_rate": (successful_notifications / total_notifications * 100) if total_notifications > 0 else 0,
-            "notifications_by_method": {
-                "email": email_count,
-                "sms": sms_count,
-                "push": push_count
-            }
+            "notifications_by_method": by_method
         }
         
     except Exception as e:
-        logger.error(f"Error getting notification stats: {e}")
+        logger.opt(exception=e).error("Error getting notification stats")
         raise HTTPException(status_code=500, detail="Failed to get notification statistics")
 
 @router.post("/device-token")
 async def register_device_token(
+    request: Request,
     device_data: Dict[str, str] = Body(...),
     current_user: dict = Depends(get_current_user_dependency),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Register device token for push notifications"""
     try:
@@ -296,14 +415,16 @@ async def register_device_token(
             raise HTTPException(status_code=400, detail="Device token is required")
         
         # Update user's device token
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
+        result = await db.execute(
+            update(User).where(User.id == user_id).values(
+                device_token=device_token, updated_at=datetime.utcnow()
+            ).returning(User.id)
+        )
+        if result.first() is None:
             raise HTTPException(status_code=404, detail="User not found")
         
-        user.device_token = device_token
-        user.updated_at = datetime.utcnow()
-        
-        db.commit()
+        await db.commit()
+        await _invalidate_preferences(request.app.state.redis, user_id)
         
         return {
             "success": True,
@@ -313,6 +434,6 @@ async def register_device_token(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error registering device token: {e}")
-        db.rollback()
+        logger.opt(exception=e).error("Error registering device token")
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Failed to register device token")
\ No newline at end of file
@@ -0,0 +1,38 @@
+import importlib
+from typing import Any
+
+from pydantic import BaseModel
+
+# Submodules are imported on first attribute access (PEP 562) so that a
+# consumer of one schema module never pays for building the others' validators
+_SUBMODULES = ("alerts", "auth", "dashboard", "forecasting", "monitoring")
+
+__all__ = list(_SUBMODULES)
+
+def __getattr__(name: str) -> Any:
+    if name in _SUBMODULES:
+        module = importlib.import_module(f".{name}", __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_SUBMODULES))
+
+def warmup() -> None:
+    """Import every schema module and finish any validator that is still unbuilt.
+    
+    Called once at startup so the first request does not pay for schema
+    construction. Models that opt into ``defer_build`` are left deferred.
+    """
+    for name in _SUBMODULES:
+        module = __getattr__(name)
+        for obj in vars(module).values():
+            if (
+                isinstance(obj, type)
+                and issubclass(obj, BaseModel)
+                and obj.__module__ == module.__name__
+                and not obj.__pydantic_complete__
+                and not obj.model_config.get("defer_build")
+            ):
+                obj.model_rebuild()
@@ -0,0 +1,32 @@
+from typing import Any, TypeVar
+
+from pydantic import BaseModel, ConfigDict
+
+from app.schemas._types import Latitude, Longitude
+
+# Response models are built server-side from trusted data, so skip the extra work input models need
+ResponseConfig = ConfigDict(extra="ignore", frozen=True, validate_assignment=False, arbitrary_types_allowed=False)
+# Shared by every response model that is also read straight from ORM rows
+OrmResponseConfig = ConfigDict(**ResponseConfig, from_attributes=True)
+
+ResponseT = TypeVar("ResponseT", bound="ResponseBase")
+
+class ResponseBase(BaseModel):
+    """Base class for response-only schemas"""
+    model_config = ResponseConfig
+    
+    @classmethod
+    def from_trusted(cls: type[ResponseT], **data: Any) -> ResponseT:
+        """Build an instance without validation.
+        
+        Only use this for data that is already known to be valid, such as values
+        read from the database or produced by a model that validated them. Nested
+        models must be passed as instances, since no coercion takes place.
+        """
+        return cls.model_construct(_fields_set=set(data), **data)
+
+
+class GeoPoint(BaseModel):
+    """Latitude/longitude pair shared by every schema that carries a position"""
+    latitude: Latitude
+    longitude: Longitude
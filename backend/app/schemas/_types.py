@@ -0,0 +1,45 @@
+from typing import Annotated, Literal
+
+from pydantic import Field, StringConstraints
+
+# Enumerated string values shared across schemas; pydantic-core checks these by set membership
+AlertType = Literal["flood", "storm_surge", "high_waves", "tsunami", "erosion", "algal_bloom", "water_quality"]
+Severity = Literal["low", "medium", "high", "critical"]
+AlertStatus = Literal["active", "acknowledged", "resolved", "expired", "cancelled"]
+Priority = Literal["low", "medium", "high", "urgent"]
+VerificationStatus = Literal["unverified", "verified", "false_positive"]
+NotificationMethod = Literal["push", "email", "sms"]
+AlertThreshold = Literal["low", "medium", "high"]
+RiskLevel = Literal["low", "medium", "high", "critical"]
+TideType = Literal["high", "low"]
+StationType = Literal["coastal", "port", "offshore", "tide", "wave", "water_quality"]
+CoastalType = Literal["beach", "port", "estuary", "bay"]
+Aggregation = Literal["hourly", "daily", "weekly"]
+ForecastType = Literal["tide", "weather", "flood_risk"]
+SystemStatus = Literal["operational", "maintenance", "error"]
+
+# Monitoring readings; the monitoring router draws simulated values from these
+Level = Literal["low", "medium", "high"]
+Intensity = Literal["none", "low", "medium", "high"]
+Trend = Literal["stable", "increasing", "decreasing"]
+BloomType = Literal["red_tide", "blue_green", "brown_tide"]
+Advisory = Literal["safe", "caution", "avoid"]
+NutrientLevel = Literal["normal", "elevated", "high"]
+QualityRating = Literal["excellent", "good", "fair", "poor"]
+ContaminationLevel = Literal["none", "trace", "moderate"]
+SewageLevel = Literal["absent", "present", "high"]
+DiscolorationLevel = Literal["none", "mild", "severe"]
+PollutionLevel = Literal["minimal", "moderate", "high"]
+EcosystemState = Literal["thriving", "stable", "stressed", "degraded"]
+ShorelineState = Literal["stable", "retreating", "advancing"]
+TemperatureTrend = Literal["stable", "warming", "cooling"]
+BiodiversityTrend = Literal["increasing", "stable", "declining"]
+
+
+# Coordinate bounds are checked by pydantic-core, so no Python validators are needed
+Latitude = Annotated[float, Field(ge=-90, le=90, description="Latitude coordinate")]
+Longitude = Annotated[float, Field(ge=-180, le=180, description="Longitude coordinate")]
+
+# Syntax-only email check: pydantic-core compiles the pattern once per schema and
+# normalizes case and whitespace, so no email-validator call runs per request
+Email = Annotated[str, StringConstraints(strip_whitespace=True, to_lower=True, pattern=r"^[^@\s]+@[^@\s]+\.[^@\s]+$")]
@@ -1,31 +1,32 @@
+from dataclasses import dataclass
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional
 from datetime import datetime
+from app.schemas._base import OrmResponseConfig, ResponseBase
+from app.schemas._types import Aggregation, CoastalType, ForecastType, RiskLevel, StationType, SystemStatus
+from .alerts import AlertResponse
 
-class MonitoringStationResponse(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class MonitoringStationResponse:
     id: str
     name: str
     latitude: float
     longitude: float
     location: str
-    station_type: str  # coastal, port, offshore
+    station_type: StationType
     is_active: bool
     last_updated: datetime
-    
-    class Config:
-        from_attributes = True
 
-class TideDataResponse(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class TideDataResponse:
     timestamp: datetime
     tide_level: float  # meters
     predicted_level: Optional[float] = None
     anomaly: float = 0.0  # difference from predicted
     station_id: str
-    
-    class Config:
-        from_attributes = True
 
-class WeatherDataResponse(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class WeatherDataResponse:
     location: str
     temperature: float  # Celsius
     humidity: float  # percentage
@@ -35,11 +36,9 @@ class WeatherDataResponse(BaseModel):
     wave_height: Optional[float] = None  # meters
     wave_period: Optional[float] = None  # seconds
     timestamp: datetime
-    
-    class Config:
-        from_attributes = True
 
-class WaveDataResponse(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class WaveDataResponse:
     timestamp: datetime
     significant_wave_height: float  # meters
     peak_wave_period: float  # seconds
@@ -47,74 +46,65 @@ class WaveDataResponse(BaseModel):
     swell_height: Optional[float] = None
     swell_period: Optional[float] = None
     station_id: str
-    
-    class Config:
-        from_attributes = True
-
-class AlertResponse(BaseModel):
-    id: str
-    alert_type: str  # flood, storm_surge, high_waves, tsunami, erosion
-    severity: str  # low, medium, high, critical
-    title: str
-    message: str
-    location: str
-    latitude: float
-    longitude: float
-    issued_at: datetime
-    expires_at: Optional[datetime] = None
-    is_active: bool
-    affected_areas: List[str] = []
-    
-    class Config:
-        from_attributes = True
 
-class DashboardSummary(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class DashboardSummary:
     total_stations: int
     active_alerts: int
-    risk_level: str  # low, medium, high, critical
+    risk_level: RiskLevel
     last_updated: datetime
-    system_status: str  # operational, maintenance, error
+    system_status: SystemStatus
     
-class ForecastResponse(BaseModel):
+class ForecastPoint(BaseModel):
+    timestamp: datetime
+    value: float
+    confidence: float  # 0.0 to 1.0
+
+class ForecastResponse(ResponseBase):
     location: str
-    forecast_type: str  # tide, weather, flood_risk
+    forecast_type: ForecastType
     forecast_hours: int
     generated_at: datetime
     confidence: float  # 0.0 to 1.0
-    predictions: List[dict]  # Time series predictions
+    predictions: list[ForecastPoint]  # Time series predictions
     
-    class Config:
-        from_attributes = True
+    model_config = OrmResponseConfig
 
-class RiskAssessment(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class RiskAssessment:
     location: str
     latitude: float
     longitude: float
-    overall_risk: str  # low, medium, high, critical
+    overall_risk: RiskLevel
     flood_probability: float  # 0.0 to 1.0
     storm_surge_risk: float  # 0.0 to 1.0
     wave_risk: float  # 0.0 to 1.0
     assessment_time: datetime
     valid_until: datetime
-    contributing_factors: List[str]
+    contributing_factors: list[str]
     
 class HistoricalDataRequest(BaseModel):
     station_id: str
     start_date: datetime
     end_date: datetime
     data_type: str  # tide, weather, wave
-    aggregation: Optional[str] = "hourly"  # hourly, daily, weekly
+    aggregation: Optional[Aggregation] = "hourly"
     
-class HistoricalDataResponse(BaseModel):
+class HistoricalPoint(BaseModel):
+    timestamp: datetime
+    value: float
+
+class HistoricalDataResponse(ResponseBase):
     station_id: str
     data_type: str
     start_date: datetime
     end_date: datetime
     data_points: int
-    aggregation: str
-    data: List[dict]
+    aggregation: Aggregation
+    data: list[HistoricalPoint]
     
-class RealtimeUpdate(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class RealtimeUpdate:
     station_id: str
     station_name: str
     data_type: str
@@ -123,20 +113,22 @@ class RealtimeUpdate(BaseModel):
     timestamp: datetime
     status: str  # normal, warning, critical
     
-class SystemHealth(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class SystemHealth:
     api_status: str
     database_status: str
-    external_apis_status: dict
+    external_apis_status: dict[str, str]  # api name -> status
     last_data_update: datetime
     active_monitoring_stations: int
     system_uptime: str
     
-class LocationData(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class LocationData:
     name: str
     latitude: float
     longitude: float
     country: str
     state: Optional[str] = None
-    coastal_type: str  # beach, port, estuary, bay
+    coastal_type: CoastalType
     population: Optional[int] = None
     elevation: Optional[float] = None  # meters above sea level
\ No newline at end of file
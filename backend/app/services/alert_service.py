@@ -1,18 +1,115 @@
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 from datetime import datetime, timedelta
 from loguru import logger
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc
-from app.database import get_db
+from sqlalchemy import and_, desc, exists, func
+from sqlalchemy.dialects.postgresql import insert
+from app.config import settings
+from app.database import SessionLocal, get_db
 from app.models.alert import Alert, AlertNotification, AlertSubscription, AlertHistory, AlertMetrics
+from app.models.types import Geography
 from app.models.user import User, UserPreferences, UserLocation
-from app.models.monitoring import MonitoringStation, TideData, WeatherData
+from app.models.monitoring import MonitoringStation, TideData, WaveData, WeatherData
 from app.services.notification_service import notification_service
 from app.services.ml_service import ml_service
+from cachetools import TTLCache
+from uuid_extensions import uuid7str
 import asyncio
-import json
-import uuid
-from geopy.distance import geodesic
+from functools import partial
+import math
+import msgspec
+import orjson
+
+# Reading in an alert's values that sets its severity, per alert type
+SEVERITY_VALUE_KEYS = {
+    'flood': 'flood_probability',
+    'tide': 'tide_level',
+    'wave': 'wave_height',
+    'storm': 'storm_intensity'
+}
+
+def _storm_values(station_data: Dict[str, Any], extras: Dict[str, Any]) -> Dict[str, float]:
+    wind_speed = station_data.get('wind_speed_kmh', 0)
+    return {
+        "wind_speed": wind_speed,
+        "pressure": station_data.get('atmospheric_pressure', 1013),
+        "storm_intensity": min(wind_speed / 100.0, 1.0)
+    }
+
+# Alert priority implied by severity when the caller gives none
+SEVERITY_PRIORITIES = {
+    'low': 'low',
+    'medium': 'medium',
+    'high': 'high',
+    'critical': 'urgent'
+}
+
+# Station alert wording and extent per alert type: (title, description, values,
+# affected_radius_km, expiry_hours). The callables take the station data and the
+# extras passed to _create_alert_from_template, which are also kept in metadata.
+ALERT_TEMPLATES = {
+    'flood': (
+        lambda station_data, extras: f"Flood Risk Alert - {extras['flood_risk'].get('risk_level', 'Unknown').title()}",
+        lambda station_data, extras: (
+            f"Flood probability: {extras['flood_risk'].get('flood_probability', 0):.1%}. "
+            f"Expected conditions may lead to coastal flooding."
+        ),
+        lambda station_data, extras: {"flood_probability": extras['flood_risk'].get('flood_probability', 0)},
+        15.0, 12
+    ),
+    'tide': (
+        lambda station_data, extras: "High Tide Alert",
+        lambda station_data, extras: (
+            f"High tide level detected: {station_data.get('tide_level', 0):.2f}m. "
+            f"Coastal areas may experience elevated water levels."
+        ),
+        lambda station_data, extras: {"tide_level": station_data.get('tide_level', 0)},
+        10.0, 6
+    ),
+    'wave': (
+        lambda station_data, extras: "High Wave Alert",
+        lambda station_data, extras: (
+            f"High waves detected: {station_data.get('wave_height', 0):.2f}m. "
+            f"Dangerous conditions for coastal activities."
+        ),
+        lambda station_data, extras: {"wave_height": station_data.get('wave_height', 0)},
+        8.0, 8
+    ),
+    'storm': (
+        lambda station_data, extras: "Storm Conditions Alert",
+        lambda station_data, extras: (
+            f"Severe weather detected. Wind: {station_data.get('wind_speed_kmh', 0):.1f} km/h, "
+            f"Pressure: {station_data.get('atmospheric_pressure', 1013):.1f} hPa. Take precautions."
+        ),
+        _storm_values,
+        25.0, 24
+    ),
+}
+
+# Origin for alert dedup buckets
+EPOCH = datetime(1970, 1, 1)
+
+class AlertSummaryLocation(msgspec.Struct):
+    name: str
+    latitude: float
+    longitude: float
+
+class AlertSummary(msgspec.Struct, omit_defaults=True):
+    """Alert row as listed by get_alerts; encode with msgspec.json.encode"""
+    id: str
+    alert_type: str
+    severity: str
+    title: str
+    description: str
+    location: AlertSummaryLocation
+    affected_radius_km: Optional[float]
+    source: Optional[str]
+    created_at: datetime
+    expires_at: Optional[datetime]
+    is_active: bool
+    acknowledged_at: Optional[datetime]
+    resolved_at: Optional[datetime]
+    metadata: Optional[Dict[str, Any]] = None
 
 class AlertService:
     """Service for managing alerts and notifications"""
@@ -44,14 +141,49 @@ class AlertService:
                 'critical': 1.0
             }
         }
+        # Severity cutoffs per alert type, highest first; below them all is 'low'
+        self.severity_cutoffs = {
+            alert_type: tuple((level, thresholds[level]) for level in ('critical', 'high', 'medium'))
+            for alert_type, thresholds in self.alert_thresholds.items()
+        }
+        # Trigger levels read on every station check, resolved once here
+        self.flood_probability_trigger = 0.3
+        self.tide_level_trigger = self.alert_thresholds['tide']['medium']
+        self.wave_height_trigger = self.alert_thresholds['wave']['medium']
+        self.storm_wind_trigger_kmh = 60
+        self.storm_pressure_trigger_hpa = 990
         self.active_monitoring = False
         self.monitoring_task = None
+        # Station alerts of one type are raised at most once per window
+        self.alert_dedup_window = timedelta(hours=2)
+        # Stations checked at once per monitoring tick
+        self.station_check_concurrency = 16
+        # Notifications from concurrent alerts are coalesced into batches of up to
+        # notification_batch_size, waiting at most notification_batch_delay seconds,
+        # with up to notification_batch_concurrency batches being sent at once
+        self.notification_batch_size = settings.notification_batch_size
+        self.notification_batch_delay = settings.notification_batch_delay_ms / 1000
+        self.notification_batch_concurrency = 8
+        self.notification_queue: asyncio.Queue = asyncio.Queue()
+        self.notification_task = None
+        # Batches being delivered, kept alive until they finish
+        self.notification_batches: Set[asyncio.Task] = set()
+        # Per-alert delivery outcomes not yet recorded in the metrics
+        self.pending_deliveries: Set[asyncio.Future] = set()
+        # AlertMetrics column values buffered off the alert path and bulk-written
+        # by a background task every metrics_flush_interval seconds
+        self.pending_metrics: List[Dict[str, Any]] = []
+        self.metrics_flush_interval = 1.0
+        self.metrics_task = None
+        # Short-lived per-worker cache of get_alerts results keyed by filter set,
+        # cleared whenever an alert is created, acknowledged or resolved
+        self.alert_list_cache: TTLCache = TTLCache(maxsize=256, ttl=10)
     
     async def create_alert(self, alert_data: Dict[str, Any], db: Session) -> Dict[str, Any]:
         """Create a new alert"""
         try:
-            # Generate alert ID
-            alert_id = str(uuid.uuid4())
+            # Time-ordered UUIDv7 keeps new alerts clustered at the end of the primary key index
+            alert_id = uuid7str()
             
             # Determine severity based on alert type and values
             severity = self._calculate_severity(
@@ -59,51 +191,59 @@ class AlertService:
                 alert_data.get('values', {})
             )
             
-            # Create alert record
-            alert = Alert(
-                id=alert_id,
-                alert_type=alert_data.get('alert_type'),
-                severity=severity,
-                title=alert_data.get('title'),
-                description=alert_data.get('description'),
-                location_name=alert_data.get('location', {}).get('name'),
-                latitude=alert_data.get('location', {}).get('latitude'),
-                longitude=alert_data.get('location', {}).get('longitude'),
-                affected_radius_km=alert_data.get('affected_radius_km', 10.0),
-                source=alert_data.get('source', 'system'),
-                source_id=alert_data.get('source_id'),
-                metadata=json.dumps(alert_data.get('metadata', {})),
-                expires_at=alert_data.get('expires_at'),
-                created_at=datetime.utcnow(),
-                is_active=True
-            )
-            
-            db.add(alert)
+            # Insert the alert, returning its stored timestamp so the response
+            # needs no refresh SELECT after the commit
+            location = alert_data.get('location', {})
+            alert = db.execute(
+                self._alert_insert(alert_id, alert_data, severity, datetime.utcnow())
+            ).first()
             db.commit()
             
+            if alert is None:
+                return {
+                    "success": False,
+                    "error": "Alert already raised for this station in the current window"
+                }
+            
+            self.alert_list_cache.clear()
+            
             # Find affected users
             affected_users = await self._find_affected_users(
-                alert_data.get('location', {}),
+                location,
                 alert_data.get('affected_radius_km', 10.0),
                 alert_data.get('alert_type'),
                 severity,
                 db
             )
             
-            # Send notifications
-            notification_results = await self._send_alert_notifications(
-                alert, affected_users, db
-            )
-            
-            # Update alert metrics
-            await self._update_alert_metrics(alert_id, len(affected_users), db)
+            # Queue notifications; delivery finishes in the background and
+            # records the alert's metrics once every user has been tried
+            deliveries = self._send_alert_notifications({
+                "id": alert.id,
+                "alert_type": alert_data.get('alert_type'),
+                "severity": severity,
+                "title": alert_data.get('title'),
+                "description": alert_data.get('description'),
+                "location": {
+                    "name": location.get('name'),
+                    "latitude": location.get('latitude'),
+                    "longitude": location.get('longitude')
+                },
+                "created_at": alert.created_at.isoformat()
+            }, affected_users)
+            self.pending_deliveries.add(deliveries)
+            deliveries.add_done_callback(self.pending_deliveries.discard)
+            deliveries.add_done_callback(partial(
+                self._record_alert_deliveries, alert_data.get('alert_type'), severity, location,
+                len(affected_users)
+            ))
             
             return {
                 "success": True,
                 "alert_id": alert_id,
                 "severity": severity,
                 "affected_users": len(affected_users),
-                "notifications_sent": notification_results.get('successful', 0),
+                "notifications_queued": len(affected_users),
                 "created_at": alert.created_at.isoformat()
             }
             
@@ -115,9 +255,49 @@ class AlertService:
                 "error": str(e)
             }
     
-    async def get_alerts(self, filters: Dict[str, Any], db: Session) -> List[Dict[str, Any]]:
+    def _alert_insert(self, alert_id: str, alert_data: Dict[str, Any], severity: str, now: datetime):
+        """INSERT ... RETURNING id, created_at for a new alert.
+        
+        Station alerts share a dedup bucket per alert_dedup_window, so a concurrent
+        duplicate inserts nothing and returns no row. Alerts with ``deduplicate``
+        false get no bucket and are always inserted.
+        """
+        location = alert_data.get('location', {})
+        source_id = alert_data.get('source_id')
+        return insert(Alert).values(
+            id=alert_id,
+            alert_type=alert_data.get('alert_type'),
+            severity=severity,
+            priority=alert_data.get('priority') or SEVERITY_PRIORITIES.get(severity, 'medium'),
+            title=alert_data.get('title'),
+            description=alert_data.get('description'),
+            location_name=location.get('name'),
+            latitude=location.get('latitude'),
+            longitude=location.get('longitude'),
+            affected_radius_km=alert_data.get('affected_radius_km', 10.0),
+            source_system=alert_data.get('source', 'system'),
+            source_id=source_id,
+            dedup_bucket=(
+                (now - EPOCH) // self.alert_dedup_window
+                if source_id and alert_data.get('deduplicate', True) else None
+            ),
+            alert_metadata=alert_data.get('metadata', {}),
+            expires_at=alert_data.get('expires_at'),
+            created_at=now,
+            is_active=True
+        ).on_conflict_do_nothing(
+            index_elements=['source_id', 'alert_type', 'dedup_bucket'],
+            index_where=Alert.dedup_bucket.isnot(None)
+        ).returning(Alert.id, Alert.created_at)
+    
+    async def get_alerts(self, filters: Dict[str, Any], db: Session) -> List[AlertSummary]:
         """Get alerts with optional filters"""
         try:
+            cache_key = orjson.dumps(filters, option=orjson.OPT_SORT_KEYS)
+            cached = self.alert_list_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            
             query = db.query(Alert)
             
             # Apply filters
@@ -137,16 +317,16 @@ class AlertService:
                 radius = filters['location'].get('radius_km', 50)
                 
                 if lat and lon:
-                    # Simple bounding box filter (more complex spatial queries would need PostGIS)
+                    # Bounding box probe answered by the GiST index on geom
                     lat_delta = radius / 111.0  # Approximate km to degrees
-                    lon_delta = radius / (111.0 * abs(lat) if lat != 0 else 111.0)
-                    
-                    query = query.filter(
-                        and_(
-                            Alert.latitude.between(lat - lat_delta, lat + lat_delta),
-                            Alert.longitude.between(lon - lon_delta, lon + lon_delta)
-                        )
+                    lon_delta = radius / (111.0 * max(math.cos(math.radians(lat)), 0.01))
+                    bbox = func.ST_MakeEnvelope(
+                        lon - lon_delta, lat - lat_delta,
+                        lon + lon_delta, lat + lat_delta,
+                        4326
                     )
+                    
+                    query = query.filter(Alert.geom.op('&&')(func.geography(bbox)))
             
             if filters.get('start_date'):
                 query = query.filter(Alert.created_at >= filters['start_date'])
@@ -161,38 +341,27 @@ class AlertService:
             limit = filters.get('limit', 50)
             alerts = query.limit(limit).all()
             
-            # Convert to response format
+            # Convert to response structs, encoded by msgspec without a dict pass
             alert_list = []
             for alert in alerts:
-                alert_dict = {
-                    "id": alert.id,
-                    "alert_type": alert.alert_type,
-                    "severity": alert.severity,
-                    "title": alert.title,
-                    "description": alert.description,
-                    "location": {
-                        "name": alert.location_name,
-                        "latitude": alert.latitude,
-                        "longitude": alert.longitude
-                    },
-                    "affected_radius_km": alert.affected_radius_km,
-                    "source": alert.source,
-                    "created_at": alert.created_at.isoformat(),
-                    "expires_at": alert.expires_at.isoformat() if alert.expires_at else None,
-                    "is_active": alert.is_active,
-                    "acknowledged_at": alert.acknowledged_at.isoformat() if alert.acknowledged_at else None,
-                    "resolved_at": alert.resolved_at.isoformat() if alert.resolved_at else None
-                }
-                
-                # Add metadata if present
-                if alert.metadata:
-                    try:
-                        alert_dict["metadata"] = json.loads(alert.metadata)
-                    except:
-                        pass
-                
-                alert_list.append(alert_dict)
-            
+                alert_list.append(AlertSummary(
+                    alert.id,
+                    alert.alert_type,
+                    alert.severity,
+                    alert.title,
+                    alert.description,
+                    AlertSummaryLocation(alert.location_name, alert.latitude, alert.longitude),
+                    alert.affected_radius_km,
+                    alert.source_system,
+                    alert.created_at,
+                    alert.expires_at,
+                    alert.is_active,
+                    alert.acknowledged_at,
+                    alert.resolved_at,
+                    alert.alert_metadata or None
+                ))
+            
+            self.alert_list_cache[cache_key] = alert_list
             return alert_list
             
         except Exception as e:
@@ -207,16 +376,22 @@ class AlertService:
             if not alert:
                 return None
             
-            # Get notification history
-            notifications = db.query(AlertNotification).filter(
+            # Summarize notification history in the database
+            notification_counts = db.query(
+                AlertNotification.status,
+                AlertNotification.notification_method,
+                func.count()
+            ).filter(
                 AlertNotification.alert_id == alert_id
+            ).group_by(
+                AlertNotification.status, AlertNotification.notification_method
             ).all()
             
             notification_summary = {
-                "total_sent": len(notifications),
-                "successful": len([n for n in notifications if n.status == 'sent']),
-                "failed": len([n for n in notifications if n.status == 'failed']),
-                "methods_used": list(set([n.delivery_method for n in notifications]))
+                "total_sent": sum(count for _, _, count in notification_counts),
+                "successful": sum(count for status, _, count in notification_counts if status == 'sent'),
+                "failed": sum(count for status, _, count in notification_counts if status == 'failed'),
+                "methods_used": list({method for _, method, _ in notification_counts})
             }
             
             return {
@@ -231,13 +406,13 @@ class AlertService:
                     "longitude": alert.longitude
                 },
                 "affected_radius_km": alert.affected_radius_km,
-                "source": alert.source,
+                "source": alert.source_system,
                 "created_at": alert.created_at.isoformat(),
                 "expires_at": alert.expires_at.isoformat() if alert.expires_at else None,
                 "is_active": alert.is_active,
                 "acknowledged_at": alert.acknowledged_at.isoformat() if alert.acknowledged_at else None,
                 "resolved_at": alert.resolved_at.isoformat() if alert.resolved_at else None,
-                "metadata": json.loads(alert.metadata) if alert.metadata else {},
+                "metadata": alert.alert_metadata or {},
                 "notifications": notification_summary
             }
             
@@ -263,7 +438,8 @@ class AlertService:
                 }
             
             # Update alert
-            alert.acknowledged_at = datetime.utcnow()
+            now = datetime.utcnow()
+            alert.acknowledged_at = now
             alert.acknowledged_by = user_id
             
             # Create acknowledgment record
@@ -271,12 +447,13 @@ class AlertService:
                 alert_id=alert_id,
                 user_id=user_id,
                 action='acknowledged',
-                timestamp=datetime.utcnow(),
-                details=json.dumps({"acknowledged_by": user_id})
+                timestamp=now,
+                details=orjson.dumps({"acknowledged_by": user_id}).decode()
             )
             
             db.add(acknowledgment)
             db.commit()
+            self.alert_list_cache.clear()
             
             return {
                 "success": True,
@@ -312,7 +489,8 @@ class AlertService:
                 }
             
             # Update alert
-            alert.resolved_at = datetime.utcnow()
+            now = datetime.utcnow()
+            alert.resolved_at = now
             alert.resolved_by = user_id
             alert.is_active = False
             alert.resolution_notes = resolution_notes
@@ -322,15 +500,16 @@ class AlertService:
                 alert_id=alert_id,
                 user_id=user_id,
                 action='resolved',
-                timestamp=datetime.utcnow(),
-                details=json.dumps({
+                timestamp=now,
+                details=orjson.dumps({
                     "resolved_by": user_id,
                     "notes": resolution_notes
-                })
+                }).decode()
             )
             
             db.add(resolution)
             db.commit()
+            self.alert_list_cache.clear()
             
             return {
                 "success": True,
@@ -362,45 +541,35 @@ class AlertService:
             if not (lat and lon):
                 return []
             
-            # Simple bounding box filter
-            lat_delta = radius / 111.0
-            lon_delta = radius / (111.0 * abs(lat) if lat != 0 else 111.0)
+            # ST_DWithin probes the GiST index on geom before computing exact distances
+            point = func.ST_SetSRID(func.ST_MakePoint(lon, lat), 4326).cast(Geography())
+            distance_m = func.ST_Distance(Alert.geom, point).label("distance_m")
             
-            alerts = db.query(Alert).filter(
+            rows = db.query(Alert, distance_m).filter(
                 and_(
-                    Alert.latitude.between(lat - lat_delta, lat + lat_delta),
-                    Alert.longitude.between(lon - lon_delta, lon + lon_delta),
+                    func.ST_DWithin(Alert.geom, point, radius * 1000),
                     Alert.created_at >= start_date
                 )
             ).order_by(desc(Alert.created_at)).all()
             
-            # Group by date and type
-            history = []
-            for alert in alerts:
-                # Calculate actual distance
-                if alert.latitude and alert.longitude:
-                    distance = geodesic(
-                        (lat, lon),
-                        (alert.latitude, alert.longitude)
-                    ).kilometers
-                    
-                    if distance <= radius:
-                        history.append({
-                            "id": alert.id,
-                            "alert_type": alert.alert_type,
-                            "severity": alert.severity,
-                            "title": alert.title,
-                            "location_name": alert.location_name,
-                            "distance_km": round(distance, 2),
-                            "created_at": alert.created_at.isoformat(),
-                            "resolved_at": alert.resolved_at.isoformat() if alert.resolved_at else None,
-                            "duration_hours": (
-                                (alert.resolved_at - alert.created_at).total_seconds() / 3600
-                                if alert.resolved_at else None
-                            )
-                        })
-            
-            return history
+            # Every returned row is already within the radius
+            return [
+                {
+                    "id": alert.id,
+                    "alert_type": alert.alert_type,
+                    "severity": alert.severity,
+                    "title": alert.title,
+                    "location_name": alert.location_name,
+                    "distance_km": round(distance / 1000, 2),
+                    "created_at": alert.created_at.isoformat(),
+                    "resolved_at": alert.resolved_at.isoformat() if alert.resolved_at else None,
+                    "duration_hours": (
+                        (alert.resolved_at - alert.created_at).total_seconds() / 3600
+                        if alert.resolved_at else None
+                    )
+                }
+                for alert, distance in rows
+            ]
             
         except Exception as e:
             logger.error(f"Error getting alert history: {e}")
@@ -474,13 +643,16 @@ class AlertService:
                     MonitoringStation.is_active == True
                 ).all()
                 
-                for station in stations:
-                    # Get latest data for each station
-                    latest_data = await self._get_latest_station_data(station.id, db)
-                    
-                    if latest_data:
-                        # Process data and check for alert conditions
-                        await self._check_alert_conditions(station, latest_data, db)
+                # Latest readings for all stations in one pass
+                now = datetime.utcnow()
+                latest = await self._get_latest_data_for_all_stations(
+                    db, now, [station.id for station in stations]
+                )
+                
+                await self._check_stations(
+                    stations, latest,
+                    lambda station, data, station_db: self._check_alert_conditions(station, data, station_db, now)
+                )
                 
                 # Check for system-wide conditions
                 await self._check_system_wide_conditions(db)
@@ -495,147 +667,113 @@ class AlertService:
                 logger.error(f"Error in monitoring loop: {e}")
                 await asyncio.sleep(60)  # Wait 1 minute before retrying
     
-    async def _get_latest_station_data(self, station_id: str, db: Session) -> Optional[Dict[str, Any]]:
-        """Get latest data from a monitoring station"""
+    async def _check_stations(self, stations: List[MonitoringStation], latest: Dict[str, Dict[str, Any]],
+                              check: Callable[[MonitoringStation, Dict[str, Any], Session], Awaitable[Any]]) -> List[Any]:
+        """Run check(station, data, db) concurrently for every station with data.
+        
+        Each check gets its own session since a Session cannot be shared, and the
+        semaphore keeps the checks within the connection pool. Results, or the
+        exception a check raised, are returned in station order.
+        """
+        semaphore = asyncio.Semaphore(self.station_check_concurrency)
+        
+        async def check_station(station: MonitoringStation):
+            async with semaphore:
+                station_db = SessionLocal()
+                try:
+                    return await check(station, latest[station.id], station_db)
+                finally:
+                    station_db.close()
+        
+        return await asyncio.gather(
+            *(check_station(station) for station in stations if station.id in latest),
+            return_exceptions=True
+        )
+    
+    async def _get_latest_data_for_all_stations(self, db: Session, now: datetime,
+                                                station_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get the latest readings for the given stations, keyed by station ID"""
         try:
-            # Get latest tide data
-            latest_tide = db.query(TideData).filter(
-                TideData.station_id == station_id
-            ).order_by(desc(TideData.timestamp)).first()
+            # DISTINCT ON keeps the newest row per station via the (station_id, timestamp DESC) indexes
+            latest_tides = db.query(TideData).filter(
+                TideData.station_id.in_(station_ids)
+            ).distinct(TideData.station_id).order_by(
+                TideData.station_id, desc(TideData.timestamp)
+            ).all()
+            
+            latest_waves = db.query(WaveData).filter(
+                WaveData.station_id.in_(station_ids)
+            ).distinct(WaveData.station_id).order_by(
+                WaveData.station_id, desc(WaveData.timestamp)
+            ).all()
             
-            # Get latest weather data
             latest_weather = db.query(WeatherData).filter(
-                WeatherData.station_id == station_id
-            ).order_by(desc(WeatherData.timestamp)).first()
+                WeatherData.station_id.in_(station_ids)
+            ).distinct(WeatherData.station_id).order_by(
+                WeatherData.station_id, desc(WeatherData.timestamp)
+            ).all()
             
-            if not latest_tide and not latest_weather:
-                return None
+            latest: Dict[str, Dict[str, Any]] = {}
             
-            data = {
-                "station_id": station_id,
-                "timestamp": datetime.utcnow()
-            }
+            def station_entry(station_id: str) -> Dict[str, Any]:
+                return latest.setdefault(station_id, {"station_id": station_id, "timestamp": now})
             
-            if latest_tide:
-                data.update({
-                    "tide_level": latest_tide.water_level,
-                    "tide_timestamp": latest_tide.timestamp
+            for tide in latest_tides:
+                station_entry(tide.station_id).update({
+                    "tide_level": tide.water_level_m,
+                    "tide_timestamp": tide.timestamp
                 })
             
-            if latest_weather:
-                data.update({
-                    "wave_height": latest_weather.wave_height,
-                    "wind_speed_kmh": latest_weather.wind_speed,
-                    "atmospheric_pressure": latest_weather.atmospheric_pressure,
-                    "weather_timestamp": latest_weather.timestamp
+            for wave in latest_waves:
+                station_entry(wave.station_id).update({
+                    "wave_height": wave.significant_wave_height_m,
+                    "wave_timestamp": wave.timestamp
                 })
             
-            return data
+            for weather in latest_weather:
+                station_entry(weather.station_id).update({
+                    "wind_speed_kmh": weather.wind_speed_kmh,
+                    "atmospheric_pressure": weather.pressure_hpa,
+                    "weather_timestamp": weather.timestamp
+                })
+            
+            return latest
             
         except Exception as e:
-            logger.error(f"Error getting station data for {station_id}: {e}")
-            return None
+            logger.error(f"Error getting latest station data: {e}")
+            return {}
     
-    async def _check_alert_conditions(self, station: MonitoringStation, data: Dict[str, Any], db: Session):
+    async def _check_alert_conditions(self, station: MonitoringStation, data: Dict[str, Any], 
+                                    db: Session, now: datetime):
         """Check if current conditions warrant an alert"""
         try:
             alerts_created = []
             
             # Check if we've already sent a similar alert recently
-            recent_cutoff = datetime.utcnow() - timedelta(hours=2)
-            
-            # Check for flood risk
-            if data.get('tide_level') or data.get('wave_height'):
-                flood_risk = await ml_service.flood_model.predict_flood_risk(data)
-                
-                if flood_risk.get('flood_probability', 0) > 0.3:
-                    # Check if similar flood alert exists recently
-                    existing_alert = db.query(Alert).filter(
-                        and_(
-                            Alert.alert_type == 'flood',
-                            Alert.source_id == station.id,
-                            Alert.created_at >= recent_cutoff,
-                            Alert.is_active == True
-                        )
-                    ).first()
-                    
-                    if not existing_alert:
-                        station_data = {
-                            "station_name": station.name,
-                            "latitude": station.latitude,
-                            "longitude": station.longitude,
-                            **data
-                        }
-                        flood_alert = await self._create_flood_alert(station_data, flood_risk, db)
-                        if flood_alert.get('success'):
-                            alerts_created.append(flood_alert['alert_id'])
-            
-            # Check for high tide alerts
-            if data.get('tide_level', 0) > self.alert_thresholds['tide']['medium']:
-                existing_alert = db.query(Alert).filter(
+            recent_cutoff = now - self.alert_dedup_window
+            active_types = {
+                alert_type for (alert_type,) in db.query(Alert.alert_type).filter(
                     and_(
-                        Alert.alert_type == 'tide',
                         Alert.source_id == station.id,
                         Alert.created_at >= recent_cutoff,
-                        Alert.is_active == True
+                        Alert.is_active == True,
+                        Alert.alert_type.in_(['flood', 'tide', 'wave', 'storm'])
                     )
-                ).first()
-                
-                if not existing_alert:
-                    station_data = {
-                        "station_name": station.name,
-                        "latitude": station.latitude,
-                        "longitude": station.longitude,
-                        **data
-                    }
-                    tide_alert = await self._create_tide_alert(station_data, db)
-                    if tide_alert.get('success'):
-                        alerts_created.append(tide_alert['alert_id'])
+                ).group_by(Alert.alert_type)
+            }
             
-            # Check for high wave alerts
-            if data.get('wave_height', 0) > self.alert_thresholds['wave']['medium']:
-                existing_alert = db.query(Alert).filter(
-                    and_(
-                        Alert.alert_type == 'wave',
-                        Alert.source_id == station.id,
-                        Alert.created_at >= recent_cutoff,
-                        Alert.is_active == True
-                    )
-                ).first()
-                
-                if not existing_alert:
-                    station_data = {
-                        "station_name": station.name,
-                        "latitude": station.latitude,
-                        "longitude": station.longitude,
-                        **data
-                    }
-                    wave_alert = await self._create_wave_alert(station_data, db)
-                    if wave_alert.get('success'):
-                        alerts_created.append(wave_alert['alert_id'])
-            
-            # Check for storm conditions
-            if (data.get('wind_speed_kmh', 0) > 60 or 
-                data.get('atmospheric_pressure', 1013) < 990):
-                existing_alert = db.query(Alert).filter(
-                    and_(
-                        Alert.alert_type == 'storm',
-                        Alert.source_id == station.id,
-                        Alert.created_at >= recent_cutoff,
-                        Alert.is_active == True
-                    )
-                ).first()
-                
-                if not existing_alert:
-                    station_data = {
-                        "station_name": station.name,
-                        "latitude": station.latitude,
-                        "longitude": station.longitude,
-                        **data
-                    }
-                    storm_alert = await self._create_storm_alert(station_data, db)
-                    if storm_alert.get('success'):
-                        alerts_created.append(storm_alert['alert_id'])
+            triggered = await self._triggered_alerts(data, skip_types=active_types)
+            if triggered:
+                station_data = {
+                    "station_name": station.name,
+                    "latitude": station.latitude,
+                    "longitude": station.longitude,
+                    **data
+                }
+                for alert_type, create in triggered:
+                    result = await create(station_data, db)
+                    if result.get('success'):
+                        alerts_created.append(result['alert_id'])
             
             if alerts_created:
                 logger.info(f"Created {len(alerts_created)} alerts for station {station.name}")
@@ -646,35 +784,36 @@ class AlertService:
     async def _check_system_wide_conditions(self, db: Session):
         """Check for system-wide conditions that might warrant alerts"""
         try:
-            # Check for multiple station failures
-            total_stations = db.query(MonitoringStation).filter(
-                MonitoringStation.is_active == True
-            ).count()
-            
-            # Check stations with recent data (last 30 minutes)
-            recent_cutoff = datetime.utcnow() - timedelta(minutes=30)
-            
-            stations_with_recent_data = db.query(MonitoringStation.id).join(
-                TideData, MonitoringStation.id == TideData.station_id
+            # Check for multiple station failures: count active stations and
+            # those with tide data in the last 30 minutes in one query
+            now = datetime.utcnow()
+            recent_cutoff = now - timedelta(minutes=30)
+            
+            recent_tide_stations = db.query(TideData.station_id).filter(
+                TideData.timestamp >= recent_cutoff
+            ).distinct().subquery()
+            
+            total_stations, stations_with_recent_data = db.query(
+                func.count(),
+                func.count().filter(recent_tide_stations.c.station_id.isnot(None))
+            ).select_from(MonitoringStation).outerjoin(
+                recent_tide_stations, recent_tide_stations.c.station_id == MonitoringStation.id
             ).filter(
-                and_(
-                    MonitoringStation.is_active == True,
-                    TideData.timestamp >= recent_cutoff
-                )
-            ).distinct().count()
+                MonitoringStation.is_active == True
+            ).one()
             
             # If less than 50% of stations are reporting, create system alert
             if total_stations > 0 and (stations_with_recent_data / total_stations) < 0.5:
                 # Check if system alert already exists
-                existing_alert = db.query(Alert).filter(
+                system_alert_exists = db.query(exists().where(
                     and_(
                         Alert.alert_type == 'system',
-                        Alert.created_at >= datetime.utcnow() - timedelta(hours=1),
+                        Alert.created_at >= now - timedelta(hours=1),
                         Alert.is_active == True
                     )
-                ).first()
+                )).scalar()
                 
-                if not existing_alert:
+                if not system_alert_exists:
                     system_alert_data = {
                         "alert_type": "system",
                         "title": "System Monitoring Alert",
@@ -691,7 +830,7 @@ class AlertService:
                             "active_stations": stations_with_recent_data,
                             "system_health": (stations_with_recent_data / total_stations) * 100
                         },
-                        "expires_at": datetime.utcnow() + timedelta(hours=4)
+                        "expires_at": now + timedelta(hours=4)
                     }
                     
                     await self.create_alert(system_alert_data, db)
@@ -705,33 +844,10 @@ class AlertService:
         try:
             alerts_created = []
             
-            # Check for flood risk
-            if station_data.get('tide_level') or station_data.get('wave_height'):
-                flood_risk = await ml_service.flood_model.predict_flood_risk(station_data)
-                
-                if flood_risk.get('flood_probability', 0) > 0.3:
-                    flood_alert = await self._create_flood_alert(station_data, flood_risk, db)
-                    if flood_alert.get('success'):
-                        alerts_created.append(flood_alert['alert_id'])
-            
-            # Check for high tide alerts
-            if station_data.get('tide_level', 0) > self.alert_thresholds['tide']['medium']:
-                tide_alert = await self._create_tide_alert(station_data, db)
-                if tide_alert.get('success'):
-                    alerts_created.append(tide_alert['alert_id'])
-            
-            # Check for high wave alerts
-            if station_data.get('wave_height', 0) > self.alert_thresholds['wave']['medium']:
-                wave_alert = await self._create_wave_alert(station_data, db)
-                if wave_alert.get('success'):
-                    alerts_created.append(wave_alert['alert_id'])
-            
-            # Check for storm conditions
-            if (station_data.get('wind_speed_kmh', 0) > 60 or 
-                station_data.get('atmospheric_pressure', 1013) < 990):
-                storm_alert = await self._create_storm_alert(station_data, db)
-                if storm_alert.get('success'):
-                    alerts_created.append(storm_alert['alert_id'])
+            for alert_type, create in await self._triggered_alerts(station_data):
+                result = await create(station_data, db)
+                if result.get('success'):
+                    alerts_created.append(result['alert_id'])
             
             return {
                 "success": True,
@@ -747,34 +863,47 @@ class AlertService:
                 "error": str(e)
             }
     
-    def _calculate_severity(self, alert_type: str, values: Dict[str, Any]) -> str:
-        """Calculate alert severity based on type and values"""
-        if alert_type not in self.alert_thresholds:
-            return 'medium'
+    async def _triggered_alerts(self, data: Dict[str, Any], skip_types: Set[str] = frozenset()
+                              ) -> List[Tuple[str, Callable[..., Awaitable[Dict[str, Any]]]]]:
+        """Alert types whose trigger conditions hold for the data, with their creators"""
+        triggered = []
         
-        thresholds = self.alert_thresholds[alert_type]
+        # The flood model is only consulted when a flood alert could still be raised
+        if 'flood' not in skip_types and (data.get('tide_level') or data.get('wave_height')):
+            flood_risk = await ml_service.flood_model.predict_flood_risk(data)
+            if flood_risk.get('flood_probability', 0) > self.flood_probability_trigger:
+                triggered.append((
+                    'flood',
+                    lambda station_data, db, **kwargs: self._create_alert_from_template(
+                        'flood', station_data, db, {"flood_risk": flood_risk}, **kwargs
+                    )
+                ))
         
-        # Get the relevant value based on alert type
-        if alert_type == 'flood':
-            value = values.get('flood_probability', 0)
-        elif alert_type == 'tide':
-            value = values.get('tide_level', 0)
-        elif alert_type == 'wave':
-            value = values.get('wave_height', 0)
-        elif alert_type == 'storm':
-            value = values.get('storm_intensity', 0)
-        else:
-            return 'medium'
+        checks = (
+            ('tide', data.get('tide_level', 0) > self.tide_level_trigger),
+            ('wave', data.get('wave_height', 0) > self.wave_height_trigger),
+            ('storm', (data.get('wind_speed_kmh', 0) > self.storm_wind_trigger_kmh or
+                       data.get('atmospheric_pressure', 1013) < self.storm_pressure_trigger_hpa)),
+        )
+        triggered.extend(
+            (alert_type, partial(self._create_alert_from_template, alert_type))
+            for alert_type, condition in checks
+            if condition and alert_type not in skip_types
+        )
         
-        # Determine severity
-        if value >= thresholds['critical']:
-            return 'critical'
-        elif value >= thresholds['high']:
-            return 'high'
-        elif value >= thresholds['medium']:
+        return triggered
+    
+    def _calculate_severity(self, alert_type: str, values: Dict[str, Any]) -> str:
+        """Calculate alert severity based on type and values"""
+        value_key = SEVERITY_VALUE_KEYS.get(alert_type)
+        if value_key is None:
             return 'medium'
-        else:
-            return 'low'
+        
+        value = values.get(value_key, 0)
+        for level, threshold in self.severity_cutoffs[alert_type]:
+            if value >= threshold:
+                return level
+        return 'low'
     
     async def _find_affected_users(self, location: Dict[str, float], 
                                  radius_km: float, alert_type: str, 
@@ -787,15 +916,17 @@ class AlertService:
             if not (lat and lon):
                 return []
             
-            # Simple bounding box to find nearby users
-            lat_delta = radius_km / 111.0
-            lon_delta = radius_km / (111.0 * abs(lat) if lat != 0 else 111.0)
+            # ST_DWithin probes the GiST index on user_locations.geom
+            point = func.ST_SetSRID(func.ST_MakePoint(lon, lat), 4326).cast(Geography())
             
-            # Get users with locations and preferences
-            users_query = db.query(User.id).join(UserLocation).join(UserPreferences).filter(
+            # Get users with a location in range and matching preferences
+            users_query = db.query(User.id).join(
+                UserLocation, UserLocation.user_id == User.id
+            ).join(
+                UserPreferences, UserPreferences.user_id == User.id
+            ).filter(
                 and_(
-                    UserLocation.latitude.between(lat - lat_delta, lat + lat_delta),
-                    UserLocation.longitude.between(lon - lon_delta, lon + lon_delta),
+                    func.ST_DWithin(UserLocation.geom, point, radius_km * 1000),
                     User.is_active == True
                 )
             )
@@ -810,186 +941,210 @@ class AlertService:
             severity_levels = ['low', 'medium', 'high', 'critical']
             if severity in severity_levels:
                 min_severity_index = severity_levels.index(severity)
-                user_severity_filters = []
-                
-                for i in range(min_severity_index + 1):
-                    user_severity_filters.append(
-                        UserPreferences.severity_threshold == severity_levels[i]
-                    )
-                
-                if user_severity_filters:
-                    users_query = users_query.filter(or_(*user_severity_filters))
-            
-            user_ids = [user.id for user in users_query.all()]
-            
-            # Filter by actual distance
-            filtered_users = []
-            for user_id in user_ids:
-                user_location = db.query(UserLocation).filter(
-                    UserLocation.user_id == user_id
-                ).first()
-                
-                if user_location and user_location.latitude and user_location.longitude:
-                    distance = geodesic(
-                        (lat, lon),
-                        (user_location.latitude, user_location.longitude)
-                    ).kilometers
-                    
-                    if distance <= radius_km:
-                        filtered_users.append(user_id)
+                users_query = users_query.filter(
+                    UserPreferences.severity_threshold.in_(severity_levels[:min_severity_index + 1])
+                )
             
-            return filtered_users
+            # A user with several locations in range is returned once
+            return [user_id for (user_id,) in users_query.distinct()]
             
         except Exception as e:
             logger.error(f"Error finding affected users: {e}")
             return []
     
-    async def _send_alert_notifications(self, alert: Alert, 
-                                      user_ids: List[str], db: Session) -> Dict[str, Any]:
-        """Send notifications for an alert"""
-        if not user_ids:
-            return {"successful": 0, "failed": 0}
+    def _send_alert_notifications(self, alert_data: Dict[str, Any], 
+                                  user_ids: List[str]) -> asyncio.Future:
+        """Queue notifications for an alert; returns a future of the per-user outcomes"""
+        # Each delivery is handed to the batching worker, which coalesces it with
+        # other alerts' deliveries to the same user
+        loop = asyncio.get_running_loop()
+        deliveries = []
+        for user_id in user_ids:
+            delivered = loop.create_future()
+            self.notification_queue.put_nowait((alert_data, user_id, delivered))
+            deliveries.append(delivered)
         
-        alert_data = {
-            "id": alert.id,
-            "alert_type": alert.alert_type,
-            "severity": alert.severity,
-            "title": alert.title,
-            "description": alert.description,
-            "location": {
-                "name": alert.location_name,
-                "latitude": alert.latitude,
-                "longitude": alert.longitude
-            },
-            "created_at": alert.created_at.isoformat()
-        }
+        if deliveries:
+            self._ensure_notification_worker()
+        return asyncio.gather(*deliveries)
+    
+    def _record_alert_deliveries(self, alert_type: str, severity: str, location: Dict[str, Any],
+                                 total: int, deliveries: asyncio.Future):
+        """Record an alert's metrics once its notifications have been delivered"""
+        if deliveries.cancelled() or deliveries.exception() is not None:
+            successful = 0
+        else:
+            successful = sum(deliveries.result())
         
-        # Send notifications in batches
-        batch_size = 10
-        successful = 0
-        failed = 0
+        self._update_alert_metrics(
+            alert_type, severity, location, {"successful": successful, "failed": total - successful}
+        )
+    
+    def _ensure_notification_worker(self):
+        """Start the notification batching worker if it is not running"""
+        if self.notification_task is None or self.notification_task.done():
+            self.notification_task = asyncio.create_task(self._dispatch_notifications())
+    
+    async def _dispatch_notifications(self):
+        """Drain queued notifications and send them in concurrent batches"""
+        loop = asyncio.get_running_loop()
+        # Bounds the batches in flight to respect provider rate limits
+        in_flight = asyncio.Semaphore(self.notification_batch_concurrency)
         
-        for i in range(0, len(user_ids), batch_size):
-            batch = user_ids[i:i + batch_size]
-            
+        async def deliver(batch):
             try:
-                result = await notification_service.send_bulk_alert(alert_data, batch, db)
-                successful += result.get('successful', 0)
-                failed += result.get('failed', 0)
-            except Exception as e:
-                logger.error(f"Error sending notification batch: {e}")
-                failed += len(batch)
+                await self._deliver_notification_batch(batch)
+            finally:
+                in_flight.release()
         
-        return {"successful": successful, "failed": failed}
+        batch = []
+        try:
+            while True:
+                batch = [await self.notification_queue.get()]
+                deadline = loop.time() + self.notification_batch_delay
+                
+                while len(batch) < self.notification_batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self.notification_queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                
+                await in_flight.acquire()
+                task = asyncio.create_task(deliver(batch))
+                batch = []
+                self.notification_batches.add(task)
+                task.add_done_callback(self.notification_batches.discard)
+        except asyncio.CancelledError:
+            # Hand a half-collected batch back so close() still delivers it
+            for item in batch:
+                self.notification_queue.put_nowait(item)
+            raise
     
-    async def _update_alert_metrics(self, alert_id: str, affected_users: int, db: Session):
-        """Update alert metrics"""
+    async def _deliver_notification_batch(self, batch: List[Tuple[Dict[str, Any], str, asyncio.Future]]):
+        """Send one batch of queued notifications and resolve their futures"""
+        # The batch outlives the sessions of the alerts that queued it
+        db = SessionLocal()
+        results = [{"success": False}] * len(batch)
         try:
-            metrics = AlertMetrics(
-                alert_id=alert_id,
-                users_notified=affected_users,
-                notification_success_rate=1.0,  # Will be updated after notifications
-                response_time_seconds=0,
-                created_at=datetime.utcnow()
+            results = await notification_service.send_batch(
+                [(alert_data, user_id) for alert_data, user_id, _ in batch], db
             )
-            
-            db.add(metrics)
+        except Exception as e:
+            logger.error(f"Error sending notification batch: {e}")
+        finally:
+            db.close()
+            # Resolved even when cancelled so no alert waits on them forever
+            for (_, _, delivered), result in zip(batch, results):
+                if not delivered.done():
+                    delivered.set_result(bool(result.get('success')))
+    
+    def _update_alert_metrics(self, alert_type: str, severity: str, location: Dict[str, Any],
+                              notification_results: Dict[str, int]):
+        """Record a single alert's metrics for the background metrics writer"""
+        if self.metrics_task is None or self.metrics_task.done():
+            self.metrics_task = asyncio.create_task(self._write_alert_metrics())
+        
+        self.pending_metrics.append({
+            "date": datetime.utcnow(),
+            "period_type": "alert",
+            "latitude": location.get('latitude'),
+            "longitude": location.get('longitude'),
+            "total_alerts": 1,
+            "alerts_by_type": {alert_type: 1},
+            "alerts_by_severity": {severity: 1},
+            "total_notifications_sent": notification_results.get('successful', 0),
+            "failed_notifications": notification_results.get('failed', 0)
+        })
+    
+    async def _write_alert_metrics(self):
+        """Write buffered alert metrics in one bulk insert per interval"""
+        while True:
+            await asyncio.sleep(self.metrics_flush_interval)
+            self._flush_alert_metrics()
+    
+    def _flush_alert_metrics(self):
+        """Bulk-insert the buffered alert metrics"""
+        if not self.pending_metrics:
+            return
+        
+        metrics, self.pending_metrics = self.pending_metrics, []
+        db = SessionLocal()
+        try:
+            db.add_all([AlertMetrics(id=uuid7str(), **values) for values in metrics])
             db.commit()
-            
         except Exception as e:
             logger.error(f"Error updating alert metrics: {e}")
+            db.rollback()
+        finally:
+            db.close()
     
-    async def _create_flood_alert(self, station_data: Dict[str, Any], 
-                                flood_risk: Dict[str, Any], db: Session) -> Dict[str, Any]:
-        """Create flood alert"""
-        alert_data = {
-            "alert_type": "flood",
-            "title": f"Flood Risk Alert - {flood_risk.get('risk_level', 'Unknown').title()}",
-            "description": f"Flood probability: {flood_risk.get('flood_probability', 0):.1%}. "
-                          f"Expected conditions may lead to coastal flooding.",
-            "location": {
-                "name": station_data.get('station_name', 'Monitoring Station'),
-                "latitude": station_data.get('latitude'),
-                "longitude": station_data.get('longitude')
-            },
-            "affected_radius_km": 15.0,
-            "values": {"flood_probability": flood_risk.get('flood_probability', 0)},
-            "metadata": {
-                "flood_risk": flood_risk,
-                "station_data": station_data
-            },
-            "expires_at": datetime.utcnow() + timedelta(hours=12)
-        }
+    async def close(self):
+        """Deliver queued notifications, stop the background workers and flush
+        buffered metrics; called at shutdown"""
+        if self.notification_task is not None:
+            self.notification_task.cancel()
+            try:
+                await self.notification_task
+            except asyncio.CancelledError:
+                pass
+            self.notification_task = None
         
-        return await self.create_alert(alert_data, db)
-    
-    async def _create_tide_alert(self, station_data: Dict[str, Any], db: Session) -> Dict[str, Any]:
-        """Create high tide alert"""
-        tide_level = station_data.get('tide_level', 0)
+        # Send whatever is still queued without waiting out the batching delay
+        in_flight = asyncio.Semaphore(self.notification_batch_concurrency)
         
-        alert_data = {
-            "alert_type": "tide",
-            "title": "High Tide Alert",
-            "description": f"High tide level detected: {tide_level:.2f}m. "
-                          f"Coastal areas may experience elevated water levels.",
-            "location": {
-                "name": station_data.get('station_name', 'Monitoring Station'),
-                "latitude": station_data.get('latitude'),
-                "longitude": station_data.get('longitude')
-            },
-            "affected_radius_km": 10.0,
-            "values": {"tide_level": tide_level},
-            "metadata": {"station_data": station_data},
-            "expires_at": datetime.utcnow() + timedelta(hours=6)
-        }
+        async def deliver(batch):
+            async with in_flight:
+                await self._deliver_notification_batch(batch)
         
-        return await self.create_alert(alert_data, db)
-    
-    async def _create_wave_alert(self, station_data: Dict[str, Any], db: Session) -> Dict[str, Any]:
-        """Create high wave alert"""
-        wave_height = station_data.get('wave_height', 0)
+        while not self.notification_queue.empty():
+            batch = [
+                self.notification_queue.get_nowait()
+                for _ in range(min(self.notification_batch_size, self.notification_queue.qsize()))
+            ]
+            task = asyncio.create_task(deliver(batch))
+            self.notification_batches.add(task)
+            task.add_done_callback(self.notification_batches.discard)
         
-        alert_data = {
-            "alert_type": "wave",
-            "title": "High Wave Alert",
-            "description": f"High waves detected: {wave_height:.2f}m. "
-                          f"Dangerous conditions for coastal activities.",
-            "location": {
-                "name": station_data.get('station_name', 'Monitoring Station'),
-                "latitude": station_data.get('latitude'),
-                "longitude": station_data.get('longitude')
-            },
-            "affected_radius_km": 8.0,
-            "values": {"wave_height": wave_height},
-            "metadata": {"station_data": station_data},
-            "expires_at": datetime.utcnow() + timedelta(hours=8)
-        }
+        if self.notification_batches:
+            await asyncio.gather(*self.notification_batches, return_exceptions=True)
+        # Lets the delivered alerts record their metrics before the final flush
+        if self.pending_deliveries:
+            await asyncio.gather(*self.pending_deliveries, return_exceptions=True)
         
-        return await self.create_alert(alert_data, db)
+        if self.metrics_task is not None:
+            self.metrics_task.cancel()
+            try:
+                await self.metrics_task
+            except asyncio.CancelledError:
+                pass
+            self.metrics_task = None
+        self._flush_alert_metrics()
     
-    async def _create_storm_alert(self, station_data: Dict[str, Any], db: Session) -> Dict[str, Any]:
-        """Create storm alert"""
-        wind_speed = station_data.get('wind_speed_kmh', 0)
-        pressure = station_data.get('atmospheric_pressure', 1013)
+    async def _create_alert_from_template(self, alert_type: str, station_data: Dict[str, Any], 
+                                        db: Session, extras: Optional[Dict[str, Any]] = None,
+                                        deduplicate: bool = True) -> Dict[str, Any]:
+        """Create a station alert worded and sized by its ALERT_TEMPLATES entry"""
+        title, description, values, radius_km, expiry_hours = ALERT_TEMPLATES[alert_type]
+        extras = extras or {}
         
         alert_data = {
-            "alert_type": "storm",
-            "title": "Storm Conditions Alert",
-            "description": f"Severe weather detected. Wind: {wind_speed:.1f} km/h, "
-                          f"Pressure: {pressure:.1f} hPa. Take precautions.",
+            "alert_type": alert_type,
+            "title": title(station_data, extras),
+            "description": description(station_data, extras),
             "location": {
                 "name": station_data.get('station_name', 'Monitoring Station'),
                 "latitude": station_data.get('latitude'),
                 "longitude": station_data.get('longitude')
             },
-            "affected_radius_km": 25.0,
-            "values": {
-                "wind_speed": wind_speed,
-                "pressure": pressure,
-                "storm_intensity": min(wind_speed / 100.0, 1.0)
-            },
-            "metadata": {"station_data": station_data},
-            "expires_at": datetime.utcnow() + timedelta(hours=24)
+            "affected_radius_km": radius_km,
+            "values": values(station_data, extras),
+            "source_id": station_data.get('station_id'),
+            "deduplicate": deduplicate,
+            "metadata": {**extras, "station_data": station_data},
+            "expires_at": datetime.utcnow() + timedelta(hours=expiry_hours)
         }
         
         return await self.create_alert(alert_data, db)
@@ -1014,13 +1169,16 @@ class AlertService:
             
             alerts_created = []
             
-            for station in stations:
-                # Get latest data for each station
-                latest_data = await self._get_latest_station_data(station.id, db)
-                
-                if latest_data:
-                    # Process data and check for alert conditions
-                    station_alerts = await self._check_alert_conditions_manual(station, latest_data, db)
+            # Latest readings for all stations in one pass
+            now = datetime.utcnow()
+            latest = await self._get_latest_data_for_all_stations(
+                db, now, [station.id for station in stations]
+            )
+            
+            for station_alerts in await self._check_stations(stations, latest, self._check_alert_conditions_manual):
+                if isinstance(station_alerts, Exception):
+                    logger.error(f"Error in manual station check: {station_alerts}")
+                else:
                     alerts_created.extend(station_alerts)
             
             # Check system-wide conditions
@@ -1031,7 +1189,7 @@ class AlertService:
                 "stations_checked": len(stations),
                 "alerts_created": len(alerts_created),
                 "alert_ids": alerts_created,
-                "checked_at": datetime.utcnow().isoformat()
+                "checked_at": now.isoformat()
             }
             
         except Exception as e:
@@ -1046,57 +1204,19 @@ class AlertService:
         try:
             alerts_created = []
             
-            # Check for flood risk
-            if data.get('tide_level') or data.get('wave_height'):
-                flood_risk = await ml_service.flood_model.predict_flood_risk(data)
-                
-                if flood_risk.get('flood_probability', 0) > 0.3:
-                    station_data = {
-                        "station_name": station.name,
-                        "latitude": station.latitude,
-                        "longitude": station.longitude,
-                        **data
-                    }
-                    flood_alert = await self._create_flood_alert(station_data, flood_risk, db)
-                    if flood_alert.get('success'):
-                        alerts_created.append(flood_alert['alert_id'])
-            
-            # Check for high tide alerts
-            if data.get('tide_level', 0) > self.alert_thresholds['tide']['medium']:
-                station_data = {
-                    "station_name": station.name,
-                    "latitude": station.latitude,
-                    "longitude": station.longitude,
-                    **data
-                }
-                tide_alert = await self._create_tide_alert(station_data, db)
-                if tide_alert.get('success'):
-                    alerts_created.append(tide_alert['alert_id'])
-            
-            # Check for high wave alerts
-            if data.get('wave_height', 0) > self.alert_thresholds['wave']['medium']:
-                station_data = {
-                    "station_name": station.name,
-                    "latitude": station.latitude,
-                    "longitude": station.longitude,
-                    **data
-                }
-                wave_alert = await self._create_wave_alert(station_data, db)
-                if wave_alert.get('success'):
-                    alerts_created.append(wave_alert['alert_id'])
-            
-            # Check for storm conditions
-            if (data.get('wind_speed_kmh', 0) > 60 or 
-                data.get('atmospheric_pressure', 1013) < 990):
+            triggered = await self._triggered_alerts(data)
+            if triggered:
                 station_data = {
                     "station_name": station.name,
                     "latitude": station.latitude,
                     "longitude": station.longitude,
                     **data
                 }
-                storm_alert = await self._create_storm_alert(station_data, db)
-                if storm_alert.get('success'):
-                    alerts_created.append(storm_alert['alert_id'])
+                for alert_type, create in triggered:
+                    # Manual checks bypass the dedup window, so no bucket is assigned
+                    result = await create(station_data, db, deduplicate=False)
+                    if result.get('success'):
+                        alerts_created.append(result['alert_id'])
             
             return alerts_created
             
@@ -1,7 +1,9 @@
 import httpx
 import asyncio
-from typing import Dict, List, Optional, Any
+from typing import Annotated, Dict, List, Optional, Any
 from datetime import datetime, timedelta
+from pydantic import Field, TypeAdapter
+from typing_extensions import NotRequired, TypedDict
 import logging
 
 logger = logging.getLogger(__name__)
@@ -9,6 +11,26 @@ import random
 import json
 from app.config import settings
 
+# NOAA datagetter payloads, renamed to our keys while pydantic-core parses the raw bytes
+class _NOAAWaterLevel(TypedDict):
+    timestamp: Annotated[str, Field(validation_alias="t")]
+    water_level_m: Annotated[float, Field(validation_alias="v")]
+    quality: NotRequired[Annotated[str, Field(validation_alias="q")]]
+
+class _NOAAPrediction(TypedDict):
+    timestamp: Annotated[str, Field(validation_alias="t")]
+    water_level_m: Annotated[float, Field(validation_alias="v")]
+    tide_type: Annotated[str, Field(validation_alias="type")]
+
+class _NOAAWaterLevelPayload(TypedDict, total=False):
+    data: List[_NOAAWaterLevel]
+
+class _NOAAPredictionPayload(TypedDict, total=False):
+    predictions: List[_NOAAPrediction]
+
+NOAA_WATER_LEVELS = TypeAdapter(_NOAAWaterLevelPayload)
+NOAA_PREDICTIONS = TypeAdapter(_NOAAPredictionPayload)
+
 class WeatherService:
     """Service for fetching weather data from OpenWeatherMap API"""
     
@@ -145,17 +167,11 @@ class NOAAService:
             response = await self.client.get(self.base_url, params=params)
             response.raise_for_status()
             
-            data = response.json()
+            # One pass over the raw body parses, renames and coerces every reading
+            data = NOAA_WATER_LEVELS.validate_json(response.content)
             
             if "data" in data:
-                return [
-                    {
-                        "timestamp": item["t"],
-                        "water_level_m": float(item["v"]),
-                        "quality": item.get("q", "good")
-                    }
-                    for item in data["data"]
-                ]
+                return data["data"]
             else:
                 return self._simulate_tide_data(hours)
                 
@@ -185,17 +201,10 @@ class NOAAService:
             response = await self.client.get(self.base_url, params=params)
             response.raise_for_status()
             
-            data = response.json()
+            data = NOAA_PREDICTIONS.validate_json(response.content)
             
             if "predictions" in data:
-                return [
-                    {
-                        "timestamp": item["t"],
-                        "water_level_m": float(item["v"]),
-                        "tide_type": item["type"]
-                    }
-                    for item in data["predictions"]
-                ]
+                return data["predictions"]
             else:
                 return self._simulate_tide_predictions(hours)
                 
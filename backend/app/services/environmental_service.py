@@ -4,11 +4,10 @@ import asyncio
 import aiohttp
 import json
 from loguru import logger
-from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text, select, func
 
 from app.config import settings
-from app.database import get_db
 from app.models.monitoring import MonitoringStation
 from app.models.environmental_data import EnvironmentalData
 
@@ -26,13 +25,14 @@ class EnvironmentalMonitoringService:
         self.cache = {}
         self.cache_duration = timedelta(minutes=15)
         
-    async def collect_all_environmental_data(self, db: Session) -> Dict[str, Any]:
+    async def collect_all_environmental_data(self, db: AsyncSession) -> Dict[str, Any]:
         """Collect environmental data from all available sources"""
         try:
             # Get all active monitoring stations
-            stations = db.query(MonitoringStation).filter(
-                MonitoringStation.is_active == True
-            ).all()
+            result = await db.execute(
+                select(MonitoringStation).where(MonitoringStation.is_active == True)
+            )
+            stations = result.scalars().all()
             
             results = {
                 'timestamp': datetime.utcnow(),
@@ -64,6 +64,9 @@ class EnvironmentalMonitoringService:
                     results['stations_data'].append(result)
                     results['summary']['successful_collections'] += 1
             
+            # Persist all station readings in one commit
+            await db.commit()
+            
             # Collect satellite and weather data
             satellite_task = self._collect_satellite_data()
             weather_task = self._collect_weather_data()
@@ -86,7 +89,7 @@ class EnvironmentalMonitoringService:
             logger.error(f"Error in collect_all_environmental_data: {e}")
             raise
     
-    async def _collect_station_data(self, station: MonitoringStation, db: Session) -> Dict[str, Any]:
+    async def _collect_station_data(self, station: MonitoringStation, db: AsyncSession) -> Dict[str, Any]:
         """Collect data for a specific monitoring station"""
         try:
             station_data = {
@@ -123,8 +126,8 @@ class EnvironmentalMonitoringService:
                 precipitation=measurements.get('precipitation', 0.0)
             )
             
+            # Committed by the caller once all stations are collected
             db.add(env_data)
-            db.commit()
             
             return station_data
             
@@ -275,7 +278,7 @@ class EnvironmentalMonitoringService:
                                 station_id: str, 
                                 start_date: datetime, 
                                 end_date: datetime,
-                                db: Session) -> List[Dict[str, Any]]:
+                                db: AsyncSession) -> List[Dict[str, Any]]:
         """Get historical environmental data for a station"""
         try:
             query = text("""
@@ -285,7 +288,7 @@ class EnvironmentalMonitoringService:
                 ORDER BY timestamp DESC
             """)
             
-            result = db.execute(query, {
+            result = await db.execute(query, {
                 'station_id': station_id,
                 'start_date': start_date,
                 'end_date': end_date
@@ -317,7 +320,7 @@ class EnvironmentalMonitoringService:
     async def analyze_environmental_trends(self, 
                                          station_id: str, 
                                          days: int,
-                                         db: Session) -> Dict[str, Any]:
+                                         db: AsyncSession) -> Dict[str, Any]:
         """Analyze environmental trends for a station"""
         try:
             end_date = datetime.utcnow()
@@ -408,12 +411,13 @@ class EnvironmentalMonitoringService:
         variance = sum((x - mean) ** 2 for x in values) / (len(values) - 1)
         return variance ** 0.5
     
-    async def get_data_quality_report(self, db: Session) -> Dict[str, Any]:
+    async def get_data_quality_report(self, db: AsyncSession) -> Dict[str, Any]:
         """Generate a data quality report for all stations"""
         try:
-            stations = db.query(MonitoringStation).filter(
-                MonitoringStation.is_active == True
-            ).all()
+            result = await db.execute(
+                select(MonitoringStation).where(MonitoringStation.is_active == True)
+            )
+            stations = result.scalars().all()
             
             report = {
                 'timestamp': datetime.utcnow(),
@@ -425,10 +429,12 @@ class EnvironmentalMonitoringService:
             
             for station in stations:
                 # Check recent data availability
-                recent_data = db.query(EnvironmentalData).filter(
-                    EnvironmentalData.station_id == station.id,
-                    EnvironmentalData.timestamp >= datetime.utcnow() - timedelta(hours=1)
-                ).count()
+                recent_data = await db.scalar(
+                    select(func.count()).select_from(EnvironmentalData).where(
+                        EnvironmentalData.station_id == station.id,
+                        EnvironmentalData.timestamp >= datetime.utcnow() - timedelta(hours=1)
+                    )
+                )
                 
                 station_quality = {
                     'station_id': station.id,
@@ -440,9 +446,11 @@ class EnvironmentalMonitoringService:
                 }
                 
                 # Get latest data
-                latest_data = db.query(EnvironmentalData).filter(
-                    EnvironmentalData.station_id == station.id
-                ).order_by(EnvironmentalData.timestamp.desc()).first()
+                latest_data = await db.scalar(
+                    select(EnvironmentalData).where(
+                        EnvironmentalData.station_id == station.id
+                    ).order_by(EnvironmentalData.timestamp.desc()).limit(1)
+                )
                 
                 if latest_data:
                     station_quality['last_update'] = latest_data.timestamp
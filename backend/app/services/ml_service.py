@@ -10,12 +10,14 @@ from sklearn.preprocessing import MinMaxScaler
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import mean_absolute_error, mean_squared_error
 import asyncio
+import os
 import tensorflow as tf
 from tensorflow import keras
 from tensorflow.keras import layers
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import LSTM, GRU, Dense, Dropout
 from tensorflow.keras.optimizers import Adam
+from app.config import settings
 
 class FloodPredictionModel:
     """LSTM-based flood prediction model"""
@@ -29,7 +31,11 @@ class FloodPredictionModel:
         self.performance_metrics = {}
         self.sequence_length = 24  # 24 hours of historical data
         self.feature_count = 8  # Number of input features
+        self.interpreter = None  # int8 TFLite interpreter used for inference
+        self.quantized_model_path = os.path.join(settings.model_storage_path, "flood_lstm_int8.tflite")
+        self.scaler_path = os.path.join(settings.model_storage_path, "flood_scaler.joblib")
         self._build_model()
+        self._load_quantized_model()
     
     def _build_model(self):
         """Build LSTM model architecture"""
@@ -58,6 +64,61 @@ class FloodPredictionModel:
             # Fallback to simple model
             self.model = None
     
+    def _quantize_model(self):
+        """Convert the trained Keras model to a dynamic-range int8 TFLite model"""
+        try:
+            converter = tf.lite.TFLiteConverter.from_keras_model(self.model)
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            converter.target_spec.supported_ops = [
+                tf.lite.OpsSet.TFLITE_BUILTINS,
+                tf.lite.OpsSet.SELECT_TF_OPS
+            ]
+            quantized_model = converter.convert()
+            
+            os.makedirs(settings.model_storage_path, exist_ok=True)
+            with open(self.quantized_model_path, "wb") as f:
+                f.write(quantized_model)
+            joblib.dump(self.scaler, self.scaler_path)
+            
+            self._load_interpreter(quantized_model)
+            logger.info(f"Quantized LSTM model saved to {self.quantized_model_path}")
+            
+        except Exception as e:
+            logger.error(f"Error quantizing LSTM model: {e}")
+            self.interpreter = None
+    
+    def _load_quantized_model(self):
+        """Load a previously quantized model and its scaler from disk"""
+        if not (os.path.exists(self.quantized_model_path) and os.path.exists(self.scaler_path)):
+            return
+        
+        try:
+            with open(self.quantized_model_path, "rb") as f:
+                self._load_interpreter(f.read())
+            self.scaler = joblib.load(self.scaler_path)
+            self.is_trained = True
+            logger.info("Quantized LSTM flood prediction model loaded successfully")
+            
+        except Exception as e:
+            logger.error(f"Error loading quantized LSTM model: {e}")
+            self.interpreter = None
+    
+    def _load_interpreter(self, model_content: bytes):
+        """Create the TFLite interpreter and cache its tensor indices"""
+        self.interpreter = tf.lite.Interpreter(model_content=model_content)
+        self.interpreter.allocate_tensors()
+        self._input_index = self.interpreter.get_input_details()[0]["index"]
+        self._output_index = self.interpreter.get_output_details()[0]["index"]
+    
+    def _predict_probability(self, scaled_features: np.ndarray) -> float:
+        """Run inference, preferring the quantized interpreter over the Keras model"""
+        if self.interpreter is not None:
+            self.interpreter.set_tensor(self._input_index, scaled_features.astype(np.float32))
+            self.interpreter.invoke()
+            return float(self.interpreter.get_tensor(self._output_index)[0][0])
+        
+        return float(self.model.predict(scaled_features, verbose=0)[0][0])
+    
     def prepare_features(self, data: Dict[str, Any]) -> np.ndarray:
         """Prepare features for flood prediction"""
         features = [
@@ -107,21 +168,21 @@ class FloodPredictionModel:
         """Predict flood risk based on current conditions and historical data"""
         try:
             # Use LSTM model if available and trained
-            if self.model is not None and self.is_trained:
+            if (self.model is not None or self.interpreter is not None) and self.is_trained:
                 if historical_data:
                     # Use sequence data for LSTM prediction
                     sequence_features = self.prepare_sequence_data(historical_data)
                     scaled_features = self.scaler.transform(sequence_features.reshape(-1, self.feature_count)).reshape(1, self.sequence_length, self.feature_count)
                     
                     # Get prediction from LSTM model
-                    flood_prob = float(self.model.predict(scaled_features, verbose=0)[0][0])
+                    flood_prob = self._predict_probability(scaled_features)
                 else:
                     # Fallback to single point prediction
                     features = self.prepare_features(input_data)
                     # Simulate sequence by repeating current data
                     sequence_features = np.tile(features, (self.sequence_length, 1)).reshape(1, self.sequence_length, self.feature_count)
                     scaled_features = self.scaler.transform(sequence_features.reshape(-1, self.feature_count)).reshape(1, self.sequence_length, self.feature_count)
-                    flood_prob = float(self.model.predict(scaled_features, verbose=0)[0][0])
+                    flood_prob = self._predict_probability(scaled_features)
                 
                 # Determine risk level
                 if flood_prob >= 0.7:
@@ -297,6 +358,9 @@ class FloodPredictionModel:
             self.is_trained = True
             self.last_training = datetime.utcnow()
             
+            # Quantize weights to int8 for faster CPU inference
+            self._quantize_model()
+            
             # Calculate performance metrics
             final_loss = history.history['loss'][-1]
             final_accuracy = history.history['accuracy'][-1]
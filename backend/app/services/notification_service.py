@@ -1,5 +1,5 @@
 import asyncio
-from typing import Dict, List, Optional, Any
+from typing import Awaitable, Callable, Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from loguru import logger
 import json
@@ -16,6 +16,22 @@ from sqlalchemy.orm import Session
 from app.models.alert import Alert, AlertNotification
 from app.models.user import User, UserPreferences
 
+# Severity color mapping
+SEVERITY_COLORS = {
+    'low': '#28a745',
+    'medium': '#ffc107', 
+    'high': '#fd7e14',
+    'critical': '#dc3545'
+}
+SEVERITY_ORDER = ['low', 'medium', 'high', 'critical']
+
+def highest_severity(alerts: List[Dict[str, Any]]) -> str:
+    """Most severe level among several alerts"""
+    return max(
+        (alert.get('severity', 'medium') for alert in alerts),
+        key=lambda severity: SEVERITY_ORDER.index(severity) if severity in SEVERITY_ORDER else 1
+    )
+
 class EmailService:
     """Service for sending email notifications"""
     
@@ -26,23 +42,30 @@ class EmailService:
         self.smtp_password = settings.smtp_password
         self.from_email = settings.from_email
     
+    def _build_message(self, to_email: str, subject: str,
+                       html_content: str, text_content: str = None) -> MIMEMultipart:
+        """Build a multipart email with optional text and HTML versions"""
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From'] = self.from_email
+        msg['To'] = to_email
+        
+        # Add text version if provided
+        if text_content:
+            text_part = MIMEText(text_content, 'plain')
+            msg.attach(text_part)
+        
+        # Add HTML version
+        html_part = MIMEText(html_content, 'html')
+        msg.attach(html_part)
+        
+        return msg
+    
     async def send_email(self, to_email: str, subject: str, 
                         html_content: str, text_content: str = None) -> bool:
         """Send email notification"""
         try:
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = self.from_email
-            msg['To'] = to_email
-            
-            # Add text version if provided
-            if text_content:
-                text_part = MIMEText(text_content, 'plain')
-                msg.attach(text_part)
-            
-            # Add HTML version
-            html_part = MIMEText(html_content, 'html')
-            msg.attach(html_part)
+            msg = self._build_message(to_email, subject, html_content, text_content)
             
             # Send email
             with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
@@ -57,6 +80,37 @@ class EmailService:
             logger.error(f"Failed to send email to {to_email}: {e}")
             return False
     
+    async def send_emails(self, emails: List[Tuple[str, str, str, Optional[str]]]) -> List[bool]:
+        """Send (to_email, subject, html_content, text_content) emails over one SMTP connection.
+        
+        Runs in a worker thread so the blocking SMTP session does not stall the event loop.
+        Returns one success flag per email.
+        """
+        return await asyncio.to_thread(self._send_emails_sync, emails)
+    
+    def _send_emails_sync(self, emails: List[Tuple[str, str, str, Optional[str]]]) -> List[bool]:
+        results = [False] * len(emails)
+        try:
+            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
+                server.starttls()
+                server.login(self.smtp_username, self.smtp_password)
+                
+                for i, (to_email, subject, html_content, text_content) in enumerate(emails):
+                    try:
+                        server.send_message(
+                            self._build_message(to_email, subject, html_content, text_content)
+                        )
+                        results[i] = True
+                    except (smtplib.SMTPRecipientsRefused, smtplib.SMTPResponseException) as e:
+                        logger.error(f"Failed to send email to {to_email}: {e}")
+            
+            logger.info(f"Sent {sum(results)}/{len(emails)} emails over one SMTP connection")
+            
+        except Exception as e:
+            logger.error(f"Failed to send batch of {len(emails)} emails: {e}")
+        
+        return results
+    
     def generate_alert_email(self, alert_data: Dict[str, Any], 
                            user_name: str = "User") -> tuple[str, str]:
         """Generate HTML and text content for alert email"""
@@ -65,15 +119,7 @@ class EmailService:
         location = alert_data.get('location', {}).get('name', 'Your area')
         description = alert_data.get('description', 'No description available')
         
-        # Severity color mapping
-        severity_colors = {
-            'low': '#28a745',
-            'medium': '#ffc107', 
-            'high': '#fd7e14',
-            'critical': '#dc3545'
-        }
-        
-        color = severity_colors.get(severity, '#6c757d')
+        color = SEVERITY_COLORS.get(severity, '#6c757d')
         
         # HTML content
         html_content = f"""
@@ -143,6 +189,74 @@ class EmailService:
         """
         
         return html_content, text_content
+    
+    def generate_alert_digest_email(self, alerts: List[Dict[str, Any]], 
+                                    user_name: str = "User") -> tuple[str, str]:
+        """Generate HTML and text content for one email covering several alerts"""
+        sections = []
+        lines = []
+        
+        for alert_data in alerts:
+            alert_type = alert_data.get('alert_type', 'General Alert')
+            severity = alert_data.get('severity', 'medium')
+            location = alert_data.get('location', {}).get('name', 'Your area')
+            description = alert_data.get('description', 'No description available')
+            color = SEVERITY_COLORS.get(severity, '#6c757d')
+            
+            sections.append(f"""
+                <div style="background: #f8f9fa; padding: 15px; margin-bottom: 10px; border-left: 4px solid {color};">
+                    <h3 style="color: {color}; margin-top: 0;">{alert_type}</h3>
+                    <p><strong>Severity:</strong> <span style="color: {color}; text-transform: uppercase; font-weight: bold;">{severity}</span></p>
+                    <p><strong>Location:</strong> {location}</p>
+                    <p>{description}</p>
+                </div>
+            """)
+            lines.append(f"- {alert_type} ({severity.upper()}) in {location}: {description}")
+        
+        alert_sections = "".join(sections)
+        alert_lines = "\n        ".join(lines)
+        
+        # HTML content
+        html_content = f"""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="utf-8">
+            <title>Coastal Alerts - {len(alerts)} new alerts</title>
+        </head>
+        <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+            <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+                <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 20px; border-radius: 8px 8px 0 0;">
+                    <h1 style="margin: 0; font-size: 24px;">🌊 Coastal Alert System</h1>
+                </div>
+                
+                <div style="background: white; padding: 20px; border: 1px solid #dee2e6;">
+                    <p>Hello {user_name}, {len(alerts)} alerts were issued for your area at {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}.</p>
+                    {alert_sections}
+                </div>
+                
+                <div style="background: #6c757d; color: white; padding: 15px; border-radius: 0 0 8px 8px; text-align: center;">
+                    <p style="margin: 0; font-size: 14px;">This is an automated alert from the Coastal Monitoring System</p>
+                    <p style="margin: 5px 0 0 0; font-size: 12px;">To manage your alert preferences, log in to your dashboard</p>
+                </div>
+            </div>
+        </body>
+        </html>
+        """
+        
+        # Text content
+        text_content = f"""
+        COASTAL ALERT SYSTEM
+        
+        {len(alerts)} alerts were issued for your area at {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}:
+        
+        {alert_lines}
+        
+        This is an automated alert from the Coastal Monitoring System.
+        To manage your alert preferences, log in to your dashboard.
+        """
+        
+        return html_content, text_content
 
 class SMSService:
     """Service for sending SMS notifications via Twilio"""
@@ -198,6 +312,20 @@ class SMSService:
         message += "Check app for details."
         
         return message[:160]  # SMS character limit
+    
+    def generate_alert_digest_sms(self, alerts: List[Dict[str, Any]]) -> str:
+        """Generate one SMS covering several alerts"""
+        severity = highest_severity(alerts)
+        alert_types = ", ".join(dict.fromkeys(alert.get('alert_type', 'Alert') for alert in alerts))
+        
+        message = f"🌊 COASTAL ALERTS: {len(alerts)} alerts ({severity.upper()}) in your area: {alert_types}. "
+        
+        if severity in ['high', 'critical']:
+            message += "Take immediate precautions. "
+        
+        message += "Check app for details."
+        
+        return message[:160]  # SMS character limit
 
 class PushNotificationService:
     """Service for sending push notifications via Firebase"""
@@ -271,6 +399,14 @@ class NotificationService:
         self.email_service = EmailService()
         self.sms_service = SMSService()
         self.push_service = PushNotificationService()
+        
+        # Sends in flight per provider, shared by every batch being delivered;
+        # each email send carries up to emails_per_connection emails on one SMTP connection
+        self.channel_concurrency = {"email": 4, "sms": 8, "push": 16}
+        self.channel_limits = {
+            channel: asyncio.Semaphore(limit) for channel, limit in self.channel_concurrency.items()
+        }
+        self.emails_per_connection = 50
     
     async def send_alert_notification(self, alert_data: Dict[str, Any], 
                                     user_id: str, db: Session) -> Dict[str, Any]:
@@ -392,6 +528,170 @@ class NotificationService:
             "sent_at": datetime.utcnow().isoformat()
         }
     
+    async def send_batch(self, notifications: List[Tuple[Dict[str, Any], str]], 
+                       db: Session) -> List[Dict[str, Any]]:
+        """Send a batch of (alert_data, user_id) notifications, possibly across alerts.
+        
+        Alerts for the same user are coalesced into one message per delivery channel,
+        and each channel is sent as a group: emails share SMTP connections and every
+        provider has its own concurrency limit. Returns one result per input pair.
+        """
+        alerts_by_user: Dict[str, List[Dict[str, Any]]] = {}
+        for alert_data, user_id in notifications:
+            alerts_by_user.setdefault(user_id, []).append(alert_data)
+        
+        try:
+            user_ids = list(alerts_by_user)
+            users = {
+                user.id: user
+                for user in db.query(User).filter(User.id.in_(user_ids))
+            }
+            preferences = {
+                prefs.user_id: prefs
+                for prefs in db.query(UserPreferences).filter(UserPreferences.user_id.in_(user_ids))
+            }
+        except Exception as e:
+            logger.error(f"Error loading recipients for notification batch: {e}")
+            return [{"success": False, "user_id": user_id, "error": str(e)} for _, user_id in notifications]
+        
+        # One message per (user, channel)
+        messages: Dict[str, List[Dict[str, Any]]] = {"email": [], "sms": [], "push": []}
+        for user_id, alerts in alerts_by_user.items():
+            user = users.get(user_id)
+            prefs = preferences.get(user_id)
+            if not user or not prefs:
+                continue
+            
+            notification_methods = prefs.notification_methods or ['email']
+            single = alerts[0] if len(alerts) == 1 else None
+            
+            if 'email' in notification_methods and user.email:
+                user_name = user.full_name or user.email
+                if single:
+                    html_content, text_content = self.email_service.generate_alert_email(single, user_name)
+                    subject = f"Coastal Alert: {single.get('alert_type', 'Alert')}"
+                else:
+                    html_content, text_content = self.email_service.generate_alert_digest_email(alerts, user_name)
+                    subject = f"Coastal Alerts: {len(alerts)} new alerts"
+                messages["email"].append({
+                    "user_id": user_id, "alerts": alerts, "recipient": user.email,
+                    "subject": subject, "html": html_content, "body": text_content
+                })
+            
+            if 'sms' in notification_methods and prefs.phone_number:
+                messages["sms"].append({
+                    "user_id": user_id, "alerts": alerts, "recipient": prefs.phone_number,
+                    "subject": None,
+                    "body": self.sms_service.generate_alert_sms(single) if single
+                    else self.sms_service.generate_alert_digest_sms(alerts)
+                })
+            
+            if 'push' in notification_methods and user.device_token:
+                if single:
+                    title = f"🌊 {single.get('alert_type', 'Coastal Alert')}"
+                    body = single.get('description', 'Check the app for details')[:100]
+                    push_data = {
+                        'alert_id': str(single.get('id', '')),
+                        'severity': single.get('severity', 'medium'),
+                        'type': 'alert'
+                    }
+                else:
+                    title = f"🌊 {len(alerts)} Coastal Alerts"
+                    body = ", ".join(dict.fromkeys(alert.get('alert_type', 'Alert') for alert in alerts))[:100]
+                    push_data = {
+                        'alert_ids': ",".join(str(alert.get('id', '')) for alert in alerts),
+                        'severity': highest_severity(alerts),
+                        'type': 'alert_digest'
+                    }
+                messages["push"].append({
+                    "user_id": user_id, "alerts": alerts, "recipient": user.device_token,
+                    "subject": title, "body": body, "data": push_data
+                })
+        
+        # Channels go out side by side, each within its provider's limit
+        email_results, sms_results, push_results = await asyncio.gather(
+            self._send_email_messages(messages["email"]),
+            self._send_limited("sms", [
+                lambda message=message: self.sms_service.send_sms(message["recipient"], message["body"])
+                for message in messages["sms"]
+            ]),
+            self._send_limited("push", [
+                lambda message=message: self.push_service.send_push_notification(
+                    message["recipient"], message["subject"], message["body"], message["data"]
+                )
+                for message in messages["push"]
+            ])
+        )
+        
+        delivered: Dict[str, Dict[str, bool]] = {}
+        sent_at = datetime.utcnow()
+        log_entries = []
+        for method, results in (("email", email_results), ("sms", sms_results), ("push", push_results)):
+            for message, success in zip(messages[method], results):
+                delivered.setdefault(message["user_id"], {})[method] = success
+                log_entries.extend(
+                    AlertNotification(
+                        alert_id=str(alert.get('id')),
+                        user_id=message["user_id"],
+                        notification_method=method,
+                        recipient=message["recipient"],
+                        subject=message["subject"],
+                        message_body=message["body"],
+                        status='sent' if success else 'failed',
+                        sent_at=sent_at if success else None,
+                        error_message=None if success else f"{method} delivery failed"
+                    )
+                    for alert in message["alerts"]
+                )
+        
+        # Log notification attempts once every channel has finished
+        try:
+            db.add_all(log_entries)
+            db.commit()
+        except Exception as e:
+            logger.error(f"Error logging {len(log_entries)} notification attempts: {e}")
+            db.rollback()
+        
+        return [
+            {
+                "success": any(delivered.get(user_id, {}).values()),
+                "user_id": user_id,
+                "results": delivered.get(user_id, {})
+            }
+            for _, user_id in notifications
+        ]
+    
+    async def _send_email_messages(self, messages: List[Dict[str, Any]]) -> List[bool]:
+        """Send emails in chunks that each reuse one SMTP connection"""
+        chunks = [
+            messages[i:i + self.emails_per_connection]
+            for i in range(0, len(messages), self.emails_per_connection)
+        ]
+        chunk_results = await self._send_limited("email", [
+            lambda chunk=chunk: self.email_service.send_emails([
+                (message["recipient"], message["subject"], message["html"], message["body"])
+                for message in chunk
+            ])
+            for chunk in chunks
+        ])
+        
+        results = []
+        for chunk, outcome in zip(chunks, chunk_results):
+            results.extend(outcome if outcome else [False] * len(chunk))
+        return results
+    
+    async def _send_limited(self, channel: str, sends: List[Callable[[], Awaitable[Any]]]) -> List[Any]:
+        """Run send calls within the channel's provider limit; failed calls yield False"""
+        async def run(send: Callable[[], Awaitable[Any]]) -> Any:
+            async with self.channel_limits[channel]:
+                try:
+                    return await send()
+                except Exception as e:
+                    logger.error(f"Notification send failed: {e}")
+                    return False
+        
+        return await asyncio.gather(*(run(send) for send in sends))
+    
     async def send_area_alert(self, alert_data: Dict[str, Any], 
                             location_bounds: Dict[str, float], 
                             db: Session) -> Dict[str, Any]:
@@ -439,13 +739,14 @@ class NotificationService:
             return {"success": False, "error": str(e)}
     
     async def send_test_notification(self, user_id: str, 
-                                   notification_type: str, db: Session) -> Dict[str, Any]:
-        """Send test notification to verify delivery methods"""
+                                   notification_type: str, db: Session,
+                                   message: Optional[str] = None) -> Dict[str, Any]:
+        """Send test notification to verify delivery methods, optionally with a custom message"""
         test_alert = {
             "id": "test-" + datetime.utcnow().strftime("%Y%m%d%H%M%S"),
             "alert_type": "Test Notification",
             "severity": "low",
-            "description": "This is a test notification to verify your alert settings are working correctly.",
+            "description": message or "This is a test notification to verify your alert settings are working correctly.",
             "location": {"name": "Test Location"},
             "timestamp": datetime.utcnow().isoformat()
         }
@@ -475,7 +776,7 @@ class NotificationService:
                 ).first()
                 
                 if preferences and preferences.phone_number:
-                    sms_content = "🌊 Test: Coastal Alert System is working correctly!"
+                    sms_content = f"🌊 Test: {message or 'Coastal Alert System is working correctly!'}"
                     result["sms"] = await self.sms_service.send_sms(
                         preferences.phone_number, sms_content
                     )
@@ -485,7 +786,7 @@ class NotificationService:
                 result["push"] = await self.push_service.send_push_notification(
                     user.device_token,
                     "🌊 Test Notification",
-                    "Coastal Alert System is working correctly!",
+                    message or "Coastal Alert System is working correctly!",
                     {"type": "test"}
                 )
                 result["success"] = result["push"]
@@ -0,0 +1,135 @@
+import asyncio
+import hashlib
+import logging
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Type
+
+from fastapi_cache import FastAPICache
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.utils.concurrency import single_flight
+
+logger = logging.getLogger(__name__)
+
+# Background refreshes kept alive until they finish
+_refresh_tasks: Set[asyncio.Task] = set()
+
+def _as_bytes(encoded: Any) -> bytes:
+    return encoded if isinstance(encoded, bytes) else str(encoded).encode()
+
+def swr_cache(
+    expire: int,
+    namespace: str,
+    key_builder: Callable[..., str],
+    stale_ttl: Optional[int] = None,
+    lock_timeout: int = 5,
+    stale_if_error: bool = True,
+    skip_if: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    response_class: Optional[Type[Response]] = None,
+    alternates: Optional[Dict[str, Type[Response]]] = None,
+):
+    """Cache an endpoint in the FastAPICache backend with stale-while-revalidate.
+
+    Entries are stored for ``expire + stale_ttl`` seconds. Once fewer than
+    ``stale_ttl`` seconds remain, the stale value is still returned while a
+    single background task, elected with a Redis ``SET NX`` lock, regenerates it.
+    Concurrent misses in the same process share one call to the endpoint.
+    With ``stale_if_error`` a failed refresh keeps serving the stale value
+    until it hard-expires; otherwise the entry is dropped. Calls for which
+    ``skip_if(kwargs)`` is true bypass the cache entirely. With ``response_class``
+    the endpoint's plain return value, fresh or cached, is wrapped in that
+    response directly, so FastAPI skips ``jsonable_encoder``. ``alternates`` maps
+    media types to response classes used instead when the request's ``Accept``
+    header names them; the cached value is shared by every representation.
+    Wrapped responses carry a weak ``ETag`` hashed from the cached bytes and a
+    ``Cache-Control: max-age`` of the remaining fresh lifetime (0 once stale);
+    a matching ``If-None-Match`` gets an empty 304 instead.
+    """
+    stale_ttl = expire if stale_ttl is None else stale_ttl
+
+    def respond(
+        value: Any,
+        request: Optional[Request],
+        encoded: Optional[bytes] = None,
+        max_age: int = 0
+    ) -> Any:
+        if isinstance(value, Response):
+            return value
+        media_type = None
+        response = None
+        if alternates and request is not None:
+            accept = request.headers.get("accept", "")
+            for alternate_type, alternate_class in alternates.items():
+                if alternate_type in accept:
+                    media_type, response = alternate_type, alternate_class
+                    break
+        if response is None:
+            if response_class is None:
+                return value
+            response = response_class
+        if encoded is None:
+            return response(value)
+
+        # Representations share the cached bytes, so the media type is part of the tag
+        etag = f'W/"{hashlib.sha1(encoded + (media_type or "").encode()).hexdigest()}"'
+        headers = {"ETag": etag, "Cache-Control": f"max-age={max_age}"}
+        if alternates:
+            headers["Vary"] = "Accept"
+        if request is not None and request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+        return response(value, headers=headers)
+
+    def decorator(func: Callable[..., Awaitable[Any]]):
+        @wraps(func)
+        async def inner(*args, **kwargs):
+            request = kwargs.get("request")
+            if skip_if is not None and skip_if(kwargs):
+                return respond(await func(*args, **kwargs), request)
+
+            backend = FastAPICache.get_backend()
+            coder = FastAPICache.get_coder()
+            # Prefix the namespace as fastapi-cache's @cache does, so key builders never add it
+            key = key_builder(
+                func, f"{FastAPICache.get_prefix()}:{namespace}",
+                request=request, response=kwargs.get("response"),
+                args=args, kwargs=kwargs
+            )
+
+            async def regenerate():
+                value = await func(*args, **kwargs)
+                encoded = coder.encode(value)
+                await backend.set(key, encoded, expire + stale_ttl)
+                return value, encoded
+
+            async def refresh():
+                try:
+                    await regenerate()
+                except Exception as e:
+                    logger.error(f"Error refreshing cache entry {key}: {e}")
+                    if not stale_if_error:
+                        await backend.clear(key=key)
+                finally:
+                    await backend.redis.delete(f"{key}:lock")
+
+            try:
+                ttl, cached = await backend.get_with_ttl(key)
+            except Exception as e:
+                logger.error(f"Error reading cache entry {key}: {e}")
+                return respond(await func(*args, **kwargs), request)
+
+            if cached is None:
+                value, encoded = await single_flight(key, regenerate)
+                return respond(value, request, _as_bytes(encoded), expire)
+
+            if ttl is not None and 0 <= ttl <= stale_ttl:
+                if await backend.redis.set(f"{key}:lock", 1, nx=True, ex=lock_timeout):
+                    task = asyncio.create_task(refresh())
+                    _refresh_tasks.add(task)
+                    task.add_done_callback(_refresh_tasks.discard)
+
+            max_age = expire if ttl is None or ttl < 0 else max(ttl - stale_ttl, 0)
+            return respond(coder.decode(cached), request, _as_bytes(cached), max_age)
+
+        return inner
+    return decorator
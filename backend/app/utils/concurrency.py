@@ -0,0 +1,29 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+# In-flight calls keyed by caller-chosen key
+_in_flight: Dict[str, asyncio.Future] = {}
+
+async def single_flight(key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+    """Coalesce concurrent calls for the same key into a single upstream call.
+    
+    The first caller runs ``factory``; callers arriving while it is still in
+    flight await the same result instead of issuing their own call.
+    """
+    future = _in_flight.get(key)
+    if future is not None:
+        return await asyncio.shield(future)
+    
+    future = asyncio.get_running_loop().create_future()
+    _in_flight[key] = future
+    try:
+        result = await factory()
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        # Mark the exception as retrieved when no other caller was waiting
+        future.exception()
+        raise
+    finally:
+        _in_flight.pop(key, None)
@@ -0,0 +1,131 @@
+import hashlib
+import logging
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import urlencode
+
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp
+
+logger = logging.getLogger(__name__)
+
+class ResponseCacheMiddleware(BaseHTTPMiddleware):
+    """Serve cached, fully serialized JSON responses for selected GET paths.
+
+    ``cached_endpoints`` maps a path prefix to its TTL in seconds. The Redis
+    client is read from ``app.state.redis``, which the application lifespan sets.
+    Sending ``Cache-Control: no-cache`` forces regeneration, and every response
+    on a cached path carries an ``X-Cache: HIT/MISS`` header. Media types in
+    ``alternate_media_types`` that appear in the ``Accept`` header are cached
+    separately from the default JSON representation.
+
+    Register it before ``CORSMiddleware`` and ``TrustedHostMiddleware`` so HITs
+    still pass through them. ``authenticate`` is awaited with the bearer token
+    before a HIT is served; a rejected token falls through to the endpoint. The
+    stored TTL is capped by the inner response's ``Cache-Control: max-age``, and
+    responses served stale (``max-age=0``) are not stored at all.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        cached_endpoints: Dict[str, int],
+        prefix: str = "ctas-response",
+        alternate_media_types: Tuple[str, ...] = (),
+        authenticate: Optional[Callable[[str], Awaitable[bool]]] = None
+    ):
+        super().__init__(app)
+        self.cached_endpoints = cached_endpoints
+        self.prefix = prefix
+        self.alternate_media_types = alternate_media_types
+        self.authenticate = authenticate
+
+    def _ttl_for(self, path: str) -> Optional[int]:
+        for endpoint, ttl in self.cached_endpoints.items():
+            if path.startswith(endpoint):
+                return ttl
+        return None
+
+    def _media_type(self, request: Request) -> str:
+        accept = request.headers.get("accept", "")
+        for media_type in self.alternate_media_types:
+            if media_type in accept:
+                return media_type
+        return "application/json"
+
+    @staticmethod
+    def _max_age(response: Response) -> Optional[int]:
+        for directive in response.headers.get("cache-control", "").split(","):
+            name, _, value = directive.strip().partition("=")
+            if name.lower() == "max-age" and value.isdigit():
+                return int(value)
+        return None
+
+    async def _authenticated(self, request: Request) -> bool:
+        if self.authenticate is None:
+            return True
+        _, _, token = request.headers.get("authorization", "").partition(" ")
+        try:
+            return await self.authenticate(token)
+        except Exception as e:
+            logger.error(f"Error revalidating token for cached response: {e}")
+            return False
+
+    def _cache_key(self, request: Request, media_type: str) -> str:
+        # Sort the query string so parameter order does not fragment the cache
+        query = urlencode(sorted(request.query_params.multi_items()))
+        # Scope entries to the bearer token so a hit never bypasses authentication
+        token = request.headers.get("authorization", "")
+        token_hash = hashlib.sha256(token.encode()).hexdigest()[:16]
+        return f"{self.prefix}:{token_hash}:{media_type}:{request.url.path}?{query}"
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        ttl = self._ttl_for(request.url.path)
+        redis = getattr(request.app.state, "redis", None)
+        if request.method != "GET" or ttl is None or redis is None:
+            return await call_next(request)
+
+        if "authorization" not in request.headers:
+            return await call_next(request)
+
+        media_type = self._media_type(request)
+        key = self._cache_key(request, media_type)
+        no_cache = "no-cache" in request.headers.get("cache-control", "").lower()
+
+        if not no_cache:
+            try:
+                cached = await redis.get(key)
+            except Exception as e:
+                logger.error(f"Error reading response cache for {key}: {e}")
+                cached = None
+            if cached is not None and await self._authenticated(request):
+                return Response(
+                    content=cached,
+                    media_type=media_type,
+                    headers={"X-Cache": "HIT"}
+                )
+
+        response = await call_next(request)
+        # Streamed bodies carry no content-length; pass them through unbuffered
+        if response.status_code != 200 or "content-length" not in response.headers:
+            response.headers["X-Cache"] = "MISS"
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        # Don't stack this TTL on top of an inner cache entry's remaining lifetime
+        max_age = self._max_age(response)
+        if max_age is not None:
+            ttl = min(ttl, max_age)
+        if ttl > 0:
+            try:
+                await redis.set(key, body, ex=ttl)
+            except Exception as e:
+                logger.error(f"Error writing response cache for {key}: {e}")
+
+        # Copy raw headers so repeated ones (Set-Cookie, Vary) survive; only the length is recomputed
+        buffered = Response(content=body, status_code=response.status_code)
+        buffered.raw_headers = [
+            (name, value) for name, value in response.raw_headers if name != b"content-length"
+        ] + [(b"content-length", str(len(body)).encode()), (b"x-cache", b"MISS")]
+        return buffered
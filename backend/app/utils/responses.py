@@ -0,0 +1,13 @@
+from typing import Any
+
+import msgspec
+from starlette.responses import Response
+
+_msgpack_encoder = msgspec.msgpack.Encoder()
+
+class MsgpackResponse(Response):
+    """Binary MessagePack response for clients that send ``Accept: application/msgpack``"""
+    media_type = "application/msgpack"
+
+    def render(self, content: Any) -> bytes:
+        return _msgpack_encoder.encode(content)
@@ -0,0 +1,31 @@
+"""Build script for the Cython-compiled schema modules.
+
+The .py sources stay importable as-is; running
+
+    python setup.py build_ext --inplace
+
+places compiled extension modules next to them, which Python then
+imports in preference to the .py files.
+"""
+from glob import glob
+
+from Cython.Build import cythonize
+from setuptools import setup
+
+schema_modules = [path for path in glob("app/schemas/*.py") if not path.endswith("__init__.py")]
+
+setup(
+    name="coastal-guard-schemas",
+    ext_modules=cythonize(
+        schema_modules,
+        language_level=3,
+        compiler_directives={
+            "boundscheck": False,
+            "wraparound": False,
+            "infer_types": True,
+            # Leave annotations as Python objects so pydantic can read the field types
+            "annotation_typing": False,
+            "binding": True,
+        },
+    ),
+)
@@ -0,0 +1,76 @@
+import os
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+
+from app.models.alert import Alert
+from app.services.alert_service import AlertService
+
+# Disposable PostGIS-enabled PostgreSQL database for the tests that execute the insert
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+STATION_ALERT = {
+    "alert_type": "tide",
+    "title": "High Tide Alert",
+    "description": "High tide level detected: 2.80m.",
+    "location": {"name": "Harbour Station", "latitude": 19.07, "longitude": 72.87},
+    "affected_radius_km": 10.0,
+    "source": "monitoring_system",
+    "source_id": "station-1",
+    "metadata": {"station_data": {"tide_level": 2.8}}
+}
+
+@pytest.fixture
+def service():
+    return AlertService()
+
+@pytest.fixture
+def connection():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    engine = create_engine(TEST_DATABASE_URL)
+    Alert.__table__.create(engine, checkfirst=True)
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        yield connection
+        transaction.rollback()
+    engine.dispose()
+
+def test_alert_insert_only_names_alert_columns(service):
+    # Compiling raises CompileError for values that are not columns of alerts
+    statement = service._alert_insert("alert-1", STATION_ALERT, "high", datetime.utcnow())
+    compiled = statement.compile(dialect=postgresql.dialect())
+
+    assert {"priority", "source_system", "alert_metadata"} <= set(compiled.params)
+
+def test_alert_insert_returns_stored_row(service, connection):
+    now = datetime.utcnow()
+    row = connection.execute(service._alert_insert("alert-1", STATION_ALERT, "critical", now)).first()
+
+    assert row.id == "alert-1"
+    assert row.created_at is not None
+    stored = connection.execute(
+        Alert.__table__.select().where(Alert.id == "alert-1")
+    ).one()
+    assert stored.priority == "urgent"
+    assert stored.source_system == "monitoring_system"
+    assert stored.alert_metadata == STATION_ALERT["metadata"]
+
+def test_alert_insert_skips_duplicate_in_dedup_window(service, connection):
+    now = datetime.utcnow()
+    connection.execute(service._alert_insert("alert-1", STATION_ALERT, "high", now))
+
+    duplicate = connection.execute(service._alert_insert("alert-2", STATION_ALERT, "high", now)).first()
+
+    assert duplicate is None
+
+def test_manual_alerts_are_not_deduplicated(service, connection):
+    now = datetime.utcnow()
+    manual_alert = {**STATION_ALERT, "deduplicate": False}
+    connection.execute(service._alert_insert("alert-1", manual_alert, "high", now))
+
+    second = connection.execute(service._alert_insert("alert-2", manual_alert, "high", now)).first()
+
+    assert second.id == "alert-2"